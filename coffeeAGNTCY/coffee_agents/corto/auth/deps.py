@@ -1,7 +1,9 @@
 # Copyright AGNTCY Contributors (https://github.com/agntcy)
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
 import os
+import time
 from typing import Annotated
 
 import jwt
@@ -10,8 +12,26 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 JWT_SECRET = os.getenv("JWT_SECRET", "change-me-in-production-use-long-secret")
 JWT_ALGORITHM = "HS256"
+_JWT_DECODE_ALGORITHMS = [JWT_ALGORITHM]
+_JWT_DECODE_OPTIONS = {"require": ["exp"]}
 security = HTTPBearer(auto_error=False)
 
+# Verified tokens -> (user dict, exp epoch). Only successful decodes are cached.
+_TOKEN_CACHE_MAX = 10_000
+_TOKEN_EXP_LEEWAY_SECONDS = 5
+_token_cache: dict[str, tuple[dict, float]] = {}
+
+
+def _cache_token(token: str, user: dict, exp: float) -> None:
+    """Remember a verified token until it expires, evicting expired then oldest entries when full."""
+    if len(_token_cache) >= _TOKEN_CACHE_MAX:
+        now = time.time()
+        for key in [k for k, (_, e) in _token_cache.items() if e <= now]:
+            del _token_cache[key]
+        if len(_token_cache) >= _TOKEN_CACHE_MAX:
+            del _token_cache[next(iter(_token_cache))]
+    _token_cache[token] = (user, exp)
+
 
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
@@ -22,31 +42,45 @@ async def get_current_user(
             detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    token = credentials.credentials
+    hit = _token_cache.get(token)
+    if hit is not None:
+        if hit[1] > time.time() + _TOKEN_EXP_LEEWAY_SECONDS:
+            return dict(hit[0])
+        _token_cache.pop(token, None)
     try:
         payload = jwt.decode(
-            credentials.credentials,
+            token,
             JWT_SECRET,
-            algorithms=[JWT_ALGORITHM],
+            algorithms=_JWT_DECODE_ALGORITHMS,
+            options=_JWT_DECODE_OPTIONS,
         )
         user_id = payload.get("sub")
         username = payload.get("username")
         role = payload.get("role")
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token")
-        return {"user_id": int(user_id), "username": username or "", "role": role or "candidate"}
+        user = {"user_id": int(user_id), "username": username or "", "role": role or "candidate"}
+        _cache_token(token, user, float(payload["exp"]))
+        return dict(user)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
+@functools.lru_cache(maxsize=8)
 def require_role(role: str):
-    """Dependency that requires the current user to have the given role (candidate or employer)."""
+    """Dependency that requires the current user to have the given role (candidate or employer).
+
+    Memoized so every Depends(require_role(role)) shares one callable and FastAPI's
+    per-callable signature and per-request dependency caches hit.
+    """
 
     async def _require_role(
         user: Annotated[dict, Depends(get_current_user)],
     ) -> dict:
-        if user.get("role") != role:
+        if user["role"] != role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Requires {role} role",
@@ -1,12 +1,16 @@
 # Copyright AGNTCY Contributors (https://github.com/agntcy)
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import os
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
 import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.session import get_session
@@ -16,6 +20,26 @@ JWT_SECRET = os.getenv("JWT_SECRET", "change-me-in-production-use-long-secret")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "60"))
 
+# Argon2id with OWASP's second recommended profile (19 MiB, t=2, p=1)
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+
+def _verify_password(password_hash: str, password: str) -> bool:
+    """Check password against an Argon2id hash, or a legacy bcrypt hash from before the switch."""
+    if password_hash.startswith("$argon2"):
+        try:
+            return _password_hasher.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+    except ValueError:
+        return False
+
+
+def _needs_rehash(password_hash: str) -> bool:
+    return not password_hash.startswith("$argon2") or _password_hasher.check_needs_rehash(password_hash)
+
 
 class AuthService:
     """Simple JWT auth: register (username/password) and login. No email verification."""
@@ -29,24 +53,20 @@ class AuthService:
         if role not in ("candidate", "employer"):
             raise ValueError("Role must be 'candidate' or 'employer'")
 
+        password_hash = await asyncio.to_thread(_password_hasher.hash, password)
         async with get_session() as session:
-            existing = (
-                await session.execute(select(User).where(User.username == username.strip()))
-            ).scalar_one_or_none()
-            if existing:
-                raise ValueError("Username already taken")
-
-            password_hash = bcrypt.hashpw(
-                password.encode("utf-8"), bcrypt.gensalt()
-            ).decode("utf-8")
+            # users.username is UNIQUE: a single INSERT both checks and claims the name
             user = User(
                 username=username.strip(),
                 password_hash=password_hash,
                 role=role,
             )
             session.add(user)
-            await session.commit()
-            await session.refresh(user)
+            try:
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                raise ValueError("Username already taken")
 
         return self._token_response(user)
 
@@ -58,10 +78,12 @@ class AuthService:
             user = (
                 await session.execute(select(User).where(User.username == username.strip()))
             ).scalar_one_or_none()
-            if not user or not bcrypt.checkpw(
-                password.encode("utf-8"), user.password_hash.encode("utf-8")
-            ):
+            if not user or not await asyncio.to_thread(_verify_password, user.password_hash, password):
                 raise ValueError("Invalid username or password")
+            # Upgrade bcrypt or outdated Argon2 parameters on successful login
+            if _needs_rehash(user.password_hash):
+                user.password_hash = await asyncio.to_thread(_password_hasher.hash, password)
+                await session.commit()
 
         return self._token_response(user)
 
@@ -0,0 +1,81 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import operator
+import os
+from typing import Any
+
+from a2a.types import (
+    SendMessageRequest,
+    MessageSendParams,
+    Message,
+    Part,
+    TextPart,
+    Role,
+)
+from agntcy_app_sdk.factory import AgntcyFactory
+
+from config.config import DEFAULT_MESSAGE_TRANSPORT, TRANSPORT_SERVER_ENDPOINT
+
+
+def text_message_request(text: str) -> SendMessageRequest:
+    """Build a user send_message request carrying one text part.
+
+    Every field is ours and already well-typed, so model_construct skips pydantic validation.
+    Both ids come from a single urandom read as 32-char hex strings.
+    """
+    ids = os.urandom(32).hex()
+    return SendMessageRequest.model_construct(
+        id=ids[:32],
+        params=MessageSendParams.model_construct(
+            message=Message.model_construct(
+                message_id=ids[32:],
+                role=Role.user,
+                parts=[Part.model_construct(TextPart.model_construct(text=text))],
+            )
+        ),
+    )
+
+
+_GET_RESULT_PARTS = operator.attrgetter("root.result.parts")
+
+
+def first_text_part(response: Any) -> str | None:
+    """Return the text of the first part of a send_message result, or None if there is none."""
+    try:
+        return _GET_RESULT_PARTS(response)[0].root.text
+    except (AttributeError, IndexError, TypeError):
+        return None
+
+
+class A2AClientCache:
+    """One transport and one A2A client per agent topic, created on first use and reused for every send."""
+
+    def __init__(self, factory: AgntcyFactory, transport_name: str):
+        self.factory = factory
+        self.transport_name = transport_name
+        # Bound once; the transport is only built on the first get()
+        self._transport_type = DEFAULT_MESSAGE_TRANSPORT
+        self._transport_kwargs = {"endpoint": TRANSPORT_SERVER_ENDPOINT, "name": transport_name}
+        self._transport = None
+        self._clients: dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+
+    async def get(self, topic: str) -> Any:
+        """Return the client for an agent topic (see A2AProtocol.create_agent_topic)."""
+        client = self._clients.get(topic)
+        if client is not None:
+            return client
+        async with self._lock:
+            client = self._clients.get(topic)
+            if client is None:
+                if self._transport is None:
+                    self._transport = self.factory.create_transport(self._transport_type, **self._transport_kwargs)
+                client = await self.factory.create_client(
+                    "A2A",
+                    agent_topic=topic,
+                    transport=self._transport,
+                )
+                self._clients[topic] = client
+        return client
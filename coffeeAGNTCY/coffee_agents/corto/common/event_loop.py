@@ -0,0 +1,17 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from typing import Any, Coroutine
+
+try:
+    import uvloop
+except ImportError:  # Windows, or uvloop not installed
+    uvloop = None
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """Run an entrypoint coroutine on uvloop when available, else on the default asyncio loop."""
+    if uvloop is not None:
+        return asyncio.run(main, loop_factory=uvloop.new_event_loop)
+    return asyncio.run(main)
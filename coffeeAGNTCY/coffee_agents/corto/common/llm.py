@@ -1,13 +1,14 @@
 # Copyright AGNTCY Contributors (https://github.com/agntcy)
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import itertools
 import logging
 import os
 from typing import Any, TypeVar
 
 from langchain_core.messages import BaseMessage
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from config.config import LLM_MODEL
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -19,7 +20,13 @@ logger = logging.getLogger("corto.common.llm")
 # ---------------------------------------------------------------------------
 
 
-class Address(BaseModel):
+class _StructuredOutput(BaseModel):
+    """Base for LLM output models: built once per response and only read afterwards."""
+
+    model_config = ConfigDict(frozen=True)
+
+
+class Address(_StructuredOutput):
     """Address fields for personal information."""
 
     street: str = Field(default="", description="Street address")
@@ -29,7 +36,7 @@ class Address(BaseModel):
     country: str = Field(default="", description="Country")
 
 
-class PersonalInformation(BaseModel):
+class PersonalInformation(_StructuredOutput):
     """Personal info: name, contact, address."""
 
     name: str = Field(default="", description="Full name")
@@ -38,7 +45,7 @@ class PersonalInformation(BaseModel):
     address: Address = Field(default_factory=Address, description="Full address")
 
 
-class EducationEntry(BaseModel):
+class EducationEntry(_StructuredOutput):
     """One education record."""
 
     degree: str = Field(default="", description="Degree (e.g. BS, MS)")
@@ -47,7 +54,7 @@ class EducationEntry(BaseModel):
     graduation_year: int | None = Field(default=None, description="Graduation year")
 
 
-class WorkExperienceEntry(BaseModel):
+class WorkExperienceEntry(_StructuredOutput):
     """One work experience record."""
 
     position: str = Field(default="", description="Job title or position")
@@ -57,7 +64,7 @@ class WorkExperienceEntry(BaseModel):
     responsibilities: list[str] = Field(default_factory=list, description="Key responsibilities")
 
 
-class AdditionalDetails(BaseModel):
+class AdditionalDetails(_StructuredOutput):
     """Languages, certifications, interests."""
 
     languages: list[str] = Field(default_factory=list, description="Languages spoken")
@@ -65,7 +72,7 @@ class AdditionalDetails(BaseModel):
     interests: list[str] = Field(default_factory=list, description="Interests or hobbies")
 
 
-class ResumeExtractOutput(BaseModel):
+class ResumeExtractOutput(_StructuredOutput):
     """Structured resume extraction: all profile fields so the LLM fills everything."""
 
     personal_information: PersonalInformation = Field(
@@ -92,7 +99,7 @@ class ResumeExtractOutput(BaseModel):
         return {"resume": self.model_dump()}
 
 
-class JobDescriptionExtractOutput(BaseModel):
+class JobDescriptionExtractOutput(_StructuredOutput):
     """Root object for job description extraction: single key 'job_description'."""
 
     job_description: dict[str, Any] = Field(
@@ -100,7 +107,7 @@ class JobDescriptionExtractOutput(BaseModel):
     )
 
 
-class GenerateJDOutput(BaseModel):
+class GenerateJDOutput(_StructuredOutput):
     """Output for AI-generated job description: title, markdown, and structured schema."""
 
     title: str = Field(description="Short job title, e.g. 'Senior Backend Engineer'")
@@ -112,20 +119,20 @@ class GenerateJDOutput(BaseModel):
     )
 
 
-class RankedCandidate(BaseModel):
+class RankedCandidate(_StructuredOutput):
     """One entry in the ranked candidates list."""
 
     profile_id: int = Field(description="Candidate profile id")
     rank: int = Field(description="1-based rank, 1 = best fit")
 
 
-class RankingOutput(BaseModel):
+class RankingOutput(_StructuredOutput):
     """Output for candidate ranking: top 5 by job fit."""
 
     ranked: list[RankedCandidate] = Field(description="Top 5 candidates with profile_id and rank (1-based)")
 
 
-class InterviewScoreOutput(BaseModel):
+class InterviewScoreOutput(_StructuredOutput):
     """Output for interview transcript scoring."""
 
     score: float = Field(description="Interview score from 0 to 100", ge=0, le=100)
@@ -138,12 +145,16 @@ DEFAULT_GEMINI_MODEL = "gemini-2.5-flash-lite"
 
 # Cached list of API keys (loaded once from env)
 _google_api_keys: list[str] | None = None
-_key_cycle: itertools.cycle | None = None
+# One chat client per API key, built lazily and rotated by reference
+_clients: dict[str, ChatGoogleGenerativeAI] = {}
+_client_cycle: itertools.cycle | None = None
+# with_structured_output runnables per (client, schema) pair
+_structured_llms: dict[tuple[int, type], Any] = {}
 
 
 def _get_google_api_keys() -> list[str]:
     """Build list of Google API keys from env (GOOGLE_API_KEYS or GOOGLE_API_KEY)."""
-    global _google_api_keys, _key_cycle
+    global _google_api_keys
     if _google_api_keys is not None:
         return _google_api_keys
     keys_raw = os.getenv("GOOGLE_API_KEYS", "").strip()
@@ -155,49 +166,56 @@ def _get_google_api_keys() -> list[str]:
             _google_api_keys = [single]
         else:
             _google_api_keys = []
-    if _google_api_keys:
-        _key_cycle = itertools.cycle(_google_api_keys)
     return _google_api_keys
 
 
-def _next_google_api_key() -> str | None:
-    """Return next key in rotation, or None if no keys configured."""
-    keys = _get_google_api_keys()
-    if not keys or _key_cycle is None:
-        return None
-    return next(_key_cycle)
+def _next_llm() -> ChatGoogleGenerativeAI:
+    """Return the next cached Gemini client in key rotation, building all clients on first use."""
+    global _client_cycle
+    if _client_cycle is None:
+        keys = _get_google_api_keys()
+        if not keys:
+            raise ValueError(
+                "No Google API key configured. Set GOOGLE_API_KEY or GOOGLE_API_KEYS in the environment."
+            )
+        model = LLM_MODEL or DEFAULT_GEMINI_MODEL
+        for key in keys:
+            _clients[key] = ChatGoogleGenerativeAI(
+                model=model,
+                api_key=key,
+                temperature=1.0,
+                max_tokens=None,
+                timeout=15,
+                max_retries=3,
+            )
+        _client_cycle = itertools.cycle(list(_clients.values()))
+        logger.info("Using Gemini LLM model=%s with key rotation (keys=%d)", model, len(_clients))
+    return next(_client_cycle)
 
 
 def get_llm():
     """
     Return a Gemini Chat model using config LLM_MODEL and Google API key(s).
-    Uses key rotation when GOOGLE_API_KEYS (comma-separated) is set.
+    Uses key rotation when GOOGLE_API_KEYS (comma-separated) is set; clients are reused across calls.
     """
-    model = LLM_MODEL or DEFAULT_GEMINI_MODEL
-    api_key = _next_google_api_key()
-    if not api_key:
-        raise ValueError(
-            "No Google API key configured. Set GOOGLE_API_KEY or GOOGLE_API_KEYS in the environment."
-        )
-    logger.info(
-        "Using Gemini LLM model=%s with key rotation (keys=%d)",
-        model,
-        len(_get_google_api_keys()),
-    )
-    return ChatGoogleGenerativeAI(
-        model=model,
-        api_key=api_key,
-        temperature=1.0,
-        max_tokens=None,
-        timeout=15,
-        max_retries=3,
-    )
+    return _next_llm()
+
+
+def _structured(llm, schema_class: type[T]):
+    """Return llm.with_structured_output(schema_class), built once per (client, schema)."""
+    key = (id(llm), schema_class)
+    structured_llm = _structured_llms.get(key)
+    if structured_llm is None:
+        structured_llm = llm.with_structured_output(schema_class)
+        _structured_llms[key] = structured_llm
+    return structured_llm
 
 
 def invoke_with_retry(messages: list[BaseMessage]):
-    """Invoke the LLM with the given messages. Retries once on failure (e.g. key rotation)."""
+    """Invoke the LLM with the given messages. Retries once on the next key on failure."""
+    llm = get_llm()
     try:
-        return get_llm().invoke(messages)
+        return llm.invoke(messages)
     except Exception as e:
         logger.warning("LLM invoke failed, retrying once: %s", e)
         return get_llm().invoke(messages)
@@ -210,14 +228,42 @@ def invoke_structured_with_retry(
     """
     Invoke the LLM with structured output. Returns an instance of schema_class.
     Uses provider-native structured output (e.g. Gemini JSON mode) when available.
-    Retries once on failure.
+    Retries once on the next key on failure.
     """
-    llm = get_llm()
-    structured_llm = llm.with_structured_output(schema_class)
+    structured_llm = _structured(get_llm(), schema_class)
     try:
         return structured_llm.invoke(messages)
     except Exception as e:
         logger.warning("Structured LLM invoke failed, retrying once: %s", e)
-        llm = get_llm()
-        structured_llm = llm.with_structured_output(schema_class)
-        return structured_llm.invoke(messages)
+        return _structured(get_llm(), schema_class).invoke(messages)
+
+
+async def ainvoke_structured_with_retry(
+    messages: list[BaseMessage],
+    schema_class: type[T],
+) -> T:
+    """Async counterpart of invoke_structured_with_retry; awaits the provider instead of blocking the event loop."""
+    structured_llm = _structured(get_llm(), schema_class)
+    try:
+        return await structured_llm.ainvoke(messages)
+    except Exception as e:
+        logger.warning("Structured LLM ainvoke failed, retrying once: %s", e)
+        return await _structured(get_llm(), schema_class).ainvoke(messages)
+
+
+async def ainvoke_structured_batch(
+    messages_list: list[list[BaseMessage]],
+    schema_class: type[T],
+    concurrency: int = 8,
+) -> list[T | BaseException]:
+    """
+    Run one structured call per message list concurrently, at most `concurrency` in flight.
+    Results keep input order; a failed call yields its exception instead of failing the batch.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(messages: list[BaseMessage]) -> T:
+        async with semaphore:
+            return await ainvoke_structured_with_retry(messages, schema_class)
+
+    return await asyncio.gather(*(_one(m) for m in messages_list), return_exceptions=True)
@@ -2,33 +2,78 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+from dataclasses import dataclass, fields
+
 from dotenv import load_dotenv
 
 load_dotenv()  # Automatically loads from `.env` or `.env.local`
 
-DEFAULT_MESSAGE_TRANSPORT = os.getenv("DEFAULT_MESSAGE_TRANSPORT", "SLIM")
-TRANSPORT_SERVER_ENDPOINT = os.getenv("TRANSPORT_SERVER_ENDPOINT", "http://localhost:46357")
-FARM_AGENT_HOST = os.getenv("FARM_AGENT_HOST", "localhost")
-FARM_AGENT_PORT = int(os.getenv("FARM_AGENT_PORT", "9999"))
 
-# Resume Mastermind agent
-RESUME_MASTERMIND_HOST = os.getenv("RESUME_MASTERMIND_HOST", "localhost")
-RESUME_MASTERMIND_PORT = int(os.getenv("RESUME_MASTERMIND_PORT", "9991"))
+@dataclass(frozen=True)
+class Settings:
+    """Process-wide settings, read from the environment once at import."""
+
+    default_message_transport: str = "SLIM"
+    transport_server_endpoint: str = "http://localhost:46357"
+    farm_agent_host: str = "localhost"
+    farm_agent_port: int = 9999
+
+    # Resume Mastermind agent
+    resume_mastermind_host: str = "localhost"
+    resume_mastermind_port: int = 9991
+
+    # Job Description Mastermind agent
+    job_description_mastermind_host: str = "localhost"
+    job_description_mastermind_port: int = 9992
+
+    # Interview Mastermind agent
+    interview_mastermind_host: str = "localhost"
+    interview_mastermind_port: int = 9993
+
+    llm_model: str = ""
+    ## Oauth2 OpenAI Provider
+    oauth2_client_id: str = ""
+    oauth2_client_secret: str = ""
+    oauth2_token_url: str = ""
+    oauth2_base_url: str = ""
+    oauth2_appkey: str = ""
+
+    logging_level: str = "INFO"
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from upper-cased env vars, falling back to field defaults."""
+        values = {}
+        for f in fields(cls):
+            raw = os.environ.get(f.name.upper())
+            if raw is not None:
+                values[f.name] = int(raw) if f.type is int else raw
+        values["logging_level"] = values.get("logging_level", cls.logging_level).upper()
+        return cls(**values)
+
+
+settings = Settings.from_env()
+
+# Module-level names kept for existing `from config.config import ...` call sites
+DEFAULT_MESSAGE_TRANSPORT = settings.default_message_transport
+TRANSPORT_SERVER_ENDPOINT = settings.transport_server_endpoint
+FARM_AGENT_HOST = settings.farm_agent_host
+FARM_AGENT_PORT = settings.farm_agent_port
+
+RESUME_MASTERMIND_HOST = settings.resume_mastermind_host
+RESUME_MASTERMIND_PORT = settings.resume_mastermind_port
 
-# Job Description Mastermind agent
-JOB_DESCRIPTION_MASTERMIND_HOST = os.getenv("JOB_DESCRIPTION_MASTERMIND_HOST", "localhost")
-JOB_DESCRIPTION_MASTERMIND_PORT = int(os.getenv("JOB_DESCRIPTION_MASTERMIND_PORT", "9992"))
+JOB_DESCRIPTION_MASTERMIND_HOST = settings.job_description_mastermind_host
+JOB_DESCRIPTION_MASTERMIND_PORT = settings.job_description_mastermind_port
 
-# Interview Mastermind agent
-INTERVIEW_MASTERMIND_HOST = os.getenv("INTERVIEW_MASTERMIND_HOST", "localhost")
-INTERVIEW_MASTERMIND_PORT = int(os.getenv("INTERVIEW_MASTERMIND_PORT", "9993"))
+INTERVIEW_MASTERMIND_HOST = settings.interview_mastermind_host
+INTERVIEW_MASTERMIND_PORT = settings.interview_mastermind_port
 
-LLM_MODEL = os.getenv("LLM_MODEL", "")
-## Oauth2 OpenAI Provider
-OAUTH2_CLIENT_ID= os.getenv("OAUTH2_CLIENT_ID", "")
-OAUTH2_CLIENT_SECRET= os.getenv("OAUTH2_CLIENT_SECRET", "")
-OAUTH2_TOKEN_URL= os.getenv("OAUTH2_TOKEN_URL", "")
-OAUTH2_BASE_URL= os.getenv("OAUTH2_BASE_URL", "")
-OAUTH2_APPKEY= os.getenv("OAUTH2_APPKEY", "")
+LLM_MODEL = settings.llm_model
+OAUTH2_CLIENT_ID = settings.oauth2_client_id
+OAUTH2_CLIENT_SECRET = settings.oauth2_client_secret
+OAUTH2_TOKEN_URL = settings.oauth2_token_url
+OAUTH2_BASE_URL = settings.oauth2_base_url
+OAUTH2_APPKEY = settings.oauth2_appkey
 
-LOGGING_LEVEL = os.getenv("LOGGING_LEVEL", "INFO").upper()
+LOGGING_LEVEL = settings.logging_level
@@ -0,0 +1,61 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import CandidateLanguage, CandidateProfile, CandidateSkill, Skill
+
+
+def _skill_names(skills: list | None) -> set[str]:
+    return {s.strip().lower()[:255] for s in (skills or []) if isinstance(s, str) and s.strip()}
+
+
+def _language_rows(languages: list | None) -> dict[str, str | None]:
+    """Map lowercased language -> proficiency. Entries are strings or {language, proficiency}."""
+    rows: dict[str, str | None] = {}
+    for entry in languages or []:
+        if isinstance(entry, str):
+            name, proficiency = entry, None
+        elif isinstance(entry, dict):
+            name, proficiency = entry.get("language") or "", entry.get("proficiency")
+        else:
+            continue
+        name = str(name).strip().lower()[:128]
+        if name:
+            rows[name] = str(proficiency)[:64] if proficiency else None
+    return rows
+
+
+async def sync_candidate_index(session: AsyncSession, profile: CandidateProfile) -> None:
+    """Rewrite the normalized skill/language rows for profile from its JSON columns.
+
+    The JSON columns stay the source of truth; these tables only back indexed search.
+    profile must already have an id (flush first for new rows). Caller commits.
+    """
+    await session.execute(delete(CandidateSkill).where(CandidateSkill.profile_id == profile.id))
+    await session.execute(delete(CandidateLanguage).where(CandidateLanguage.profile_id == profile.id))
+
+    names = _skill_names(profile.skills)
+    if names:
+        skill_ids = dict(
+            (await session.execute(select(Skill.name, Skill.id).where(Skill.name.in_(names)))).all()
+        )
+        new_names = names.difference(skill_ids)
+        if new_names:
+            # Another profile may be adding the same new skill concurrently: insert-or-ignore, then read the ids back
+            await session.execute(
+                insert(Skill)
+                .values([{"name": n} for n in new_names])
+                .on_conflict_do_nothing(index_elements=[Skill.name])
+            )
+            skill_ids.update(
+                (await session.execute(select(Skill.name, Skill.id).where(Skill.name.in_(new_names)))).all()
+            )
+        session.add_all(CandidateSkill(profile_id=profile.id, skill_id=sid) for sid in skill_ids.values())
+
+    session.add_all(
+        CandidateLanguage(profile_id=profile.id, language=lang, proficiency=prof)
+        for lang, prof in _language_rows(profile.languages).items()
+    )
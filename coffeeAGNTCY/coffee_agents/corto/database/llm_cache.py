@@ -0,0 +1,112 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import LlmCache
+from database.session import get_session
+
+logger = logging.getLogger("corto.database.llm_cache")
+
+LLM_CACHE_TTL = timedelta(days=7)
+
+
+def cache_key(prompt_version: str, model_id: str, *inputs: bytes) -> str:
+    """sha256 over the prompt version, model and inputs, each prefixed with its 8-byte length so fields cannot run together."""
+    h = hashlib.sha256()
+    for part in (prompt_version.encode("utf-8"), model_id.encode("utf-8"), *inputs):
+        h.update(len(part).to_bytes(8, "big"))
+        h.update(part)
+    return h.hexdigest()
+
+
+async def get_cached_response(session: AsyncSession, input_hash: str) -> dict[str, Any] | None:
+    """Return the cached response for input_hash, or None when missing or expired."""
+    return (
+        await session.execute(
+            select(LlmCache.response).where(
+                LlmCache.input_hash == input_hash,
+                LlmCache.expires_at > datetime.now(timezone.utc),
+            )
+        )
+    ).scalar_one_or_none()
+
+
+async def get_cached_responses(session: AsyncSession, input_hashes: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """Unexpired cached responses for several hashes in one query, keyed by hash."""
+    hashes = set(input_hashes)
+    if not hashes:
+        return {}
+    rows = await session.execute(
+        select(LlmCache.input_hash, LlmCache.response).where(
+            LlmCache.input_hash.in_(hashes),
+            LlmCache.expires_at > datetime.now(timezone.utc),
+        )
+    )
+    return dict(rows.all())
+
+
+async def put_cached_response(
+    session: AsyncSession,
+    input_hash: str,
+    prompt_version: str,
+    model_id: str,
+    response: dict[str, Any],
+    ttl: timedelta = LLM_CACHE_TTL,
+) -> None:
+    """Insert or refresh a cache entry with one atomic upsert, so concurrent writers of a key never conflict. Caller commits."""
+    now = datetime.now(timezone.utc)
+    stmt = insert(LlmCache).values(
+        input_hash=input_hash,
+        prompt_version=prompt_version,
+        model_id=model_id,
+        response=response,
+        created_at=now,
+        expires_at=now + ttl,
+    )
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[LlmCache.input_hash],
+            set_={
+                "prompt_version": stmt.excluded.prompt_version,
+                "model_id": stmt.excluded.model_id,
+                "response": stmt.excluded.response,
+                "created_at": stmt.excluded.created_at,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        )
+    )
+
+
+async def delete_cached_response(session: AsyncSession, input_hash: str) -> None:
+    """Drop a cache entry, e.g. one whose stored response no longer fits its output model. Caller commits."""
+    await session.execute(delete(LlmCache).where(LlmCache.input_hash == input_hash))
+
+
+async def store_cached_responses(
+    prompt_version: str,
+    model_id: str,
+    responses: dict[str, dict[str, Any]],
+    ttl: timedelta = LLM_CACHE_TTL,
+) -> None:
+    """Upsert {input_hash: response} entries in a short-lived session of their own.
+
+    Best effort: the cache is an optimization, so a failed write is logged and never raised to the caller.
+    """
+    if not responses:
+        return
+    try:
+        async with get_session() as session:
+            for input_hash, response in responses.items():
+                await put_cached_response(session, input_hash, prompt_version, model_id, response, ttl)
+            await session.commit()
+    except Exception as e:
+        logger.warning("llm_cache write for %s failed: %s", prompt_version, e)
+
@@ -4,7 +4,7 @@
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text
 from sqlalchemy.dialects.sqlite import JSON
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -53,16 +53,48 @@ class CandidateProfile(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utc_now, onupdate=_utc_now)
 
 
+class Skill(Base):
+    """Normalized skill name (lowercased), shared across candidate profiles."""
+
+    __tablename__ = "skills"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
+
+
+class CandidateSkill(Base):
+    """Candidate profile <-> skill link, mirrored from CandidateProfile.skills for indexed lookups."""
+
+    __tablename__ = "candidate_skills"
+    __table_args__ = (Index("ix_candidate_skills_skill_profile", "skill_id", "profile_id"),)
+
+    profile_id: Mapped[int] = mapped_column(ForeignKey("candidate_profiles.id"), primary_key=True)
+    skill_id: Mapped[int] = mapped_column(ForeignKey("skills.id"), primary_key=True)
+
+
+class CandidateLanguage(Base):
+    """One language per row, mirrored from CandidateProfile.languages for indexed lookups."""
+
+    __tablename__ = "candidate_languages"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    profile_id: Mapped[int] = mapped_column(ForeignKey("candidate_profiles.id"), nullable=False, index=True)
+    language: Mapped[str] = mapped_column(String(128), nullable=False, index=True)  # lowercased
+    proficiency: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+
 class ResumeBlob(Base):
     """Last uploaded resume file, extracted text, and parsed resume schema per candidate."""
 
     __tablename__ = "resume_blobs"
+    __table_args__ = (Index("ix_resume_user_created", "user_id", "created_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     file_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     content_type: Mapped[str | None] = mapped_column(String(128), nullable=True)
-    file_content: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    # Deferred: the file bytes load only on explicit undefer() (download), not on every row fetch
+    file_content: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
     extracted_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     parsed_schema: Mapped[dict | None] = mapped_column(JSON, nullable=True)  # { "resume": { ... } }
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utc_now)
@@ -70,6 +102,7 @@ class ResumeBlob(Base):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_employer_status", "employer_id", "status"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     employer_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -85,6 +118,11 @@ class JobCandidate(Base):
     """Link job to candidate; stores invite, decision, score."""
 
     __tablename__ = "job_candidates"
+    __table_args__ = (
+        Index("ix_jc_job_rank", "job_id", "rank"),
+        Index("ix_jc_job_selected", "job_id", "selected_top_3"),
+        Index("ix_jc_profile_job", "candidate_profile_id", "job_id", unique=True),  # one link per (job, candidate)
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     job_id: Mapped[int] = mapped_column(ForeignKey("jobs.id"), nullable=False, index=True)
@@ -113,4 +151,18 @@ class InterviewSession(Base):
     transcript: Mapped[str | None] = mapped_column(Text, nullable=True)
     score: Mapped[float | None] = mapped_column(nullable=True)
     recording_url: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    # Interviewer system prompt (JD + profile + questions), built at join so chat turns skip rebuilding it
+    cached_system_prompt: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+
+class LlmCache(Base):
+    """Content-addressed LLM extraction results (e.g. resume ingest), keyed by a hash of model, prompt and input."""
+
+    __tablename__ = "llm_cache"
+
+    input_hash: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256 hex, see database.llm_cache
+    prompt_version: Mapped[str] = mapped_column(String(64), nullable=False)
+    model_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    response: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utc_now)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,15 +1,20 @@
 # Copyright AGNTCY Contributors (https://github.com/agntcy)
 # SPDX-License-Identifier: Apache-2.0
 
+import logging
 import os
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
-from sqlalchemy import text
+import orjson
+from sqlalchemy import event, inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from database.models import Base
 
+logger = logging.getLogger("corto.database.session")
+
 # Use SQLite by default (no psycopg2 required). Set DATABASE_URL to a postgres URL only when using PostgreSQL.
 _default_sqlite = "sqlite+aiosqlite:///./corto.db"
 _env_url = (os.getenv("DATABASE_URL") or "").strip()
@@ -18,11 +23,54 @@ if not _env_url or "postgresql" in _env_url or _env_url.startswith("postgres://"
 else:
     DATABASE_URL = _env_url
 
+
+def _json_dumps(value: Any) -> str:
+    """orjson-backed serializer for all JSON columns (str result, as SQLAlchemy expects)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+_engine_kwargs: dict[str, Any] = {}
+_in_memory_sqlite = DATABASE_URL.startswith("sqlite") and (":memory:" in DATABASE_URL or DATABASE_URL.endswith("://"))
+if not _in_memory_sqlite:
+    # LIFO hands back the most recently used (warm) connection; idle overflow connections age out.
+    # DATABASE_URL is always SQLite (see above): connections are in-process, so there is no per-checkout ping.
+    _engine_kwargs.update(
+        poolclass=AsyncAdaptedQueuePool,
+        pool_use_lifo=True,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=False,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        connect_args={"check_same_thread": False},
+    )
+
 engine = create_async_engine(
     DATABASE_URL,
     echo=os.getenv("SQL_ECHO", "").lower() in ("1", "true", "yes"),
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+    **_engine_kwargs,
+)
+
+# Applied to every new pooled SQLite connection; with the LIFO pool these stay open and warm
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
 )
 
+if DATABASE_URL.startswith("sqlite") and not _in_memory_sqlite:
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _tune_sqlite_connection(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
 async_session_factory = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -41,17 +89,46 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-def _add_resume_blobs_parsed_schema(conn) -> None:
-    """Add parsed_schema column to resume_blobs if missing (one-off migration)."""
-    result = conn.execute(
-        text("SELECT 1 FROM pragma_table_info('resume_blobs') WHERE name = 'parsed_schema'")
-    )
-    if result.fetchone() is None:
-        conn.execute(text("ALTER TABLE resume_blobs ADD COLUMN parsed_schema TEXT"))
+# (table, column, SQL type) for nullable columns added after their table first shipped
+_ADDED_COLUMNS = (
+    ("resume_blobs", "parsed_schema", "TEXT"),
+    ("interview_sessions", "cached_system_prompt", "TEXT"),
+)
+
+
+def _add_missing_columns(conn) -> None:
+    """Add columns missing from existing tables (create_all does not alter tables)."""
+    inspector = inspect(conn)
+    for table, column, sql_type in _ADDED_COLUMNS:
+        columns = {c["name"] for c in inspector.get_columns(table)}
+        if column not in columns:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}"))
+
+
+def _create_missing_indexes(conn) -> None:
+    """Create model indexes on tables that predate them (create_all skips existing tables)."""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                index.create(conn)
+            except Exception as e:
+                logger.warning("Could not create index %s on %s: %s", index.name, table.name, e)
+
+
+_db_initialized = False
 
 
 async def init_db() -> None:
-    """Create all tables. Safe to call on startup."""
+    """Create all tables and apply one-off migrations. Safe to call on startup; runs once per process."""
+    global _db_initialized
+    if _db_initialized:
+        return
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-        await conn.run_sync(_add_resume_blobs_parsed_schema)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_create_missing_indexes)
+    _db_initialized = True
@@ -0,0 +1,25 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+# Run the FastAPI server using uvicorn (from repo root: python -m exchange)
+# Import-safe launcher: multiprocessing never re-imports a package's __main__ in spawned children, so uvicorn
+# workers and the resume extract pool only import what they need instead of re-running the app setup.
+
+import importlib.util
+import os
+
+import uvicorn
+
+from common import event_loop
+
+# EXCHANGE_WORKERS > 1 runs that many processes (each with its own pools and background tasks); reload needs a single worker
+workers = int(os.getenv("EXCHANGE_WORKERS", "1"))
+uvicorn.run(
+    "exchange.main:app",
+    host="0.0.0.0",
+    port=8000,
+    reload=workers == 1,
+    workers=workers,
+    loop="uvloop" if event_loop.uvloop else "asyncio",
+    http="httptools" if importlib.util.find_spec("httptools") else "h11",
+)
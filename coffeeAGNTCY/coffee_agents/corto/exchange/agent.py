@@ -1,25 +1,16 @@
 # Copyright AGNTCY Contributors (https://github.com/agntcy)
 # SPDX-License-Identifier: Apache-2.0
 
-import json
 import logging
-from uuid import uuid4
 from typing import Any
 
+import orjson
 from ioa_observe.sdk.decorators import agent
 from agntcy_app_sdk.factory import AgntcyFactory
 from agntcy_app_sdk.semantic.a2a.protocol import A2AProtocol
-from config.config import DEFAULT_MESSAGE_TRANSPORT, TRANSPORT_SERVER_ENDPOINT
+from common.a2a_clients import A2AClientCache, first_text_part, text_message_request
 from langchain_core.messages import HumanMessage, SystemMessage
 from common.llm import get_llm
-from a2a.types import (
-    SendMessageRequest,
-    MessageSendParams,
-    Message,
-    Part,
-    TextPart,
-    Role,
-)
 
 from resume_mastermind.card import AGENT_CARD as resume_agent_card
 from job_description_mastermind.card import AGENT_CARD as job_description_agent_card
@@ -27,6 +18,10 @@ from interview_mastermind.card import AGENT_CARD as interview_agent_card
 
 logger = logging.getLogger("corto.exchange.agent")
 
+RESUME_AGENT_TOPIC = A2AProtocol.create_agent_topic(resume_agent_card)
+JOB_DESCRIPTION_AGENT_TOPIC = A2AProtocol.create_agent_topic(job_description_agent_card)
+INTERVIEW_AGENT_TOPIC = A2AProtocol.create_agent_topic(interview_agent_card)
+
 tools = [
     {
         "type": "function",
@@ -119,39 +114,59 @@ system_prompt = (
 )
 
 
+# Merged under the LLM's tool args once, so payload builders can index instead of .get()
+_TOOL_ARG_DEFAULTS = {
+    "action": "",
+    "resume_text": "",
+    "job_description": "",
+    "schedule_interview": True,
+    "prompt": "",
+}
+
+
+def _resume_mastermind_payload(tool_args: dict) -> dict:
+    if tool_args["action"] == "ingest_resume":
+        return {"action": "ingest_resume", "resume_text": tool_args["resume_text"]}
+    return {"action": "best_match", "job_description": tool_args["job_description"]}
+
+
+def _job_description_mastermind_payload(tool_args: dict) -> dict:
+    return {
+        "job_description": tool_args["job_description"],
+        "schedule_interview": tool_args["schedule_interview"],
+    }
+
+
+def _interview_mastermind_payload(tool_args: dict) -> dict:
+    return {
+        "job_description": tool_args["job_description"],
+        "resume_text": tool_args["resume_text"],
+    }
+
+
+# Mastermind tool name -> (agent topic, payload builder from tool args)
+_TOOL_DISPATCH = {
+    "call_resume_mastermind": (RESUME_AGENT_TOPIC, _resume_mastermind_payload),
+    "call_job_description_mastermind": (JOB_DESCRIPTION_AGENT_TOPIC, _job_description_mastermind_payload),
+    "call_interview_mastermind": (INTERVIEW_AGENT_TOPIC, _interview_mastermind_payload),
+}
+
+
 @agent(name="exchange_agent")
 class ExchangeAgent:
     def __init__(self, factory: AgntcyFactory):
         self.factory = factory
+        self._a2a_clients = A2AClientCache(factory, "default/default/exchange")
+        self._farm_topic: str | None = None
 
-    async def _send_to_agent(self, agent_card: Any, payload: dict) -> str:
+    async def _send_to_agent(self, agent_topic: str, payload: dict) -> str:
         """Send JSON payload to an A2A agent and return the text response."""
-        topic = A2AProtocol.create_agent_topic(agent_card)
-        transport = self.factory.create_transport(
-            DEFAULT_MESSAGE_TRANSPORT,
-            endpoint=TRANSPORT_SERVER_ENDPOINT,
-            name="default/default/exchange",
-        )
-        client = await self.factory.create_client(
-            "A2A",
-            agent_topic=topic,
-            transport=transport,
-        )
-        request = SendMessageRequest(
-            id=str(uuid4()),
-            params=MessageSendParams(
-                message=Message(
-                    message_id=str(uuid4()),
-                    role=Role.user,
-                    parts=[Part(TextPart(text=json.dumps(payload)))],
-                )
-            ),
-        )
+        client = await self._a2a_clients.get(agent_topic)
+        request = text_message_request(orjson.dumps(payload).decode("utf-8"))
         response = await client.send_message(request)
-        if response.root.result and response.root.result.parts:
-            part = response.root.result.parts[0].root
-            if hasattr(part, "text"):
-                return part.text
+        text = first_text_part(response)
+        if text is not None:
+            return text
         if response.root.error:
             raise ValueError(f"A2A error: {response.root.error.message}")
         return ""
@@ -161,86 +176,37 @@ class ExchangeAgent:
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt),
         ]
-        response = get_llm().invoke(messages, tools=tools)
-
-        if hasattr(response, "tool_calls") and response.tool_calls:
-            for tool_call in response.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call.get("args", {})
-                logger.info("Tool called: %s with %s", tool_name, tool_args)
-
-                if tool_name == "call_resume_mastermind":
-                    action = tool_args.get("action")
-                    if action == "ingest_resume":
-                        payload = {
-                            "action": "ingest_resume",
-                            "resume_text": tool_args.get("resume_text", ""),
-                        }
-                    else:
-                        payload = {
-                            "action": "best_match",
-                            "job_description": tool_args.get("job_description", ""),
-                        }
-                    result = await self._send_to_agent(resume_agent_card, payload)
-                    return result
-
-                if tool_name == "call_job_description_mastermind":
-                    payload = {
-                        "job_description": tool_args.get("job_description", ""),
-                        "schedule_interview": tool_args.get(
-                            "schedule_interview", True
-                        ),
-                    }
-                    result = await self._send_to_agent(
-                        job_description_agent_card, payload
-                    )
-                    return result
-
-                if tool_name == "call_interview_mastermind":
-                    payload = {
-                        "job_description": tool_args.get("job_description", ""),
-                        "resume_text": tool_args.get("resume_text", ""),
-                    }
-                    result = await self._send_to_agent(
-                        interview_agent_card, payload
-                    )
-                    return result
-
-                if tool_name == "a2a_client_send_message":
-                    return await self.a2a_client_send_message(
-                        tool_args.get("prompt", "")
-                    )
+        response = await get_llm().ainvoke(messages, tools=tools)
+
+        tool_calls = getattr(response, "tool_calls", None)
+        if tool_calls:
+            # The router answers with a single tool call; act on the first one only
+            tool_call = tool_calls[0]
+            tool_name = tool_call["name"]
+            tool_args = {**_TOOL_ARG_DEFAULTS, **(tool_call.get("args") or {})}
+            # Args can carry a whole resume; log only the key names, and only at DEBUG
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Tool called: %s with keys=%s", tool_name, list(tool_call.get("args") or ()))
+
+            if tool_name == "a2a_client_send_message":
+                return await self.a2a_client_send_message(tool_args["prompt"])
+            route = _TOOL_DISPATCH.get(tool_name)
+            if route is not None:
+                agent_topic, build_payload = route
+                return await self._send_to_agent(agent_topic, build_payload(tool_args))
 
         return response.content if hasattr(response, "content") else str(response)
 
     async def a2a_client_send_message(self, prompt: str) -> str:
         """Send plain-text prompt to the farm (coffee flavor) agent."""
-        topic = A2AProtocol.create_agent_topic(farm_agent_card)
-        transport = self.factory.create_transport(
-            DEFAULT_MESSAGE_TRANSPORT,
-            endpoint=TRANSPORT_SERVER_ENDPOINT,
-            name="default/default/exchange",
-        )
-        client = await self.factory.create_client(
-            "A2A",
-            agent_topic=topic,
-            transport=transport,
-        )
-        request = SendMessageRequest(
-            id=str(uuid4()),
-            params=MessageSendParams(
-                message=Message(
-                    message_id=str(uuid4()),
-                    role=Role.user,
-                    parts=[Part(TextPart(text=prompt))],
-                )
-            ),
-        )
+        if self._farm_topic is None:
+            self._farm_topic = A2AProtocol.create_agent_topic(farm_agent_card)
+        client = await self._a2a_clients.get(self._farm_topic)
+        request = text_message_request(prompt)
         response = await client.send_message(request)
-        if response.root.result and response.root.result.parts:
-            part = response.root.result.parts[0].root
-            if hasattr(part, "text"):
-                return part.text
+        text = first_text_part(response)
+        if text is not None:
+            return text
         if response.root.error:
             raise ValueError(f"A2A error: {response.root.error.message}")
         return ""
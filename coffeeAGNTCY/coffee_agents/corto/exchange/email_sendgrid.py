@@ -1,10 +1,17 @@
 # Copyright AGNTCY Contributors (https://github.com/agntcy)
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import html
 import os
 import logging
+import re
+from string import Template
 from typing import Any
 
+import httpx
+import orjson
+
 logger = logging.getLogger("corto.exchange.email")
 
 SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY", "")
@@ -12,33 +19,68 @@ SENDGRID_FROM_EMAIL = os.getenv("SENDGRID_FROM_EMAIL", "noreply@example.com")
 SENDGRID_FROM_NAME = os.getenv("SENDGRID_FROM_NAME", "Corto Recruitment")
 FRONTEND_BASE_URL = os.getenv("FRONTEND_BASE_URL", "http://localhost:3000")
 
+SENDGRID_MAIL_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+_FROM = {"email": SENDGRID_FROM_EMAIL, "name": SENDGRID_FROM_NAME}
+
+# Bounds in-flight /mail/send requests across all callers (invite fan-out, batch chunks) to stay under rate limits
+SENDGRID_MAX_CONCURRENCY = int(os.getenv("SENDGRID_MAX_CONCURRENCY", "10"))
+_send_semaphore = asyncio.Semaphore(SENDGRID_MAX_CONCURRENCY)
+
+# Built on first send and reused: one keep-alive HTTP/2 connection multiplexes concurrent sends
+_http_client: httpx.AsyncClient | None = None
+
+
+def _client() -> httpx.AsyncClient | None:
+    global _http_client
+    if _http_client is None and SENDGRID_API_KEY:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            timeout=30.0,
+            headers={
+                "Authorization": f"Bearer {SENDGRID_API_KEY}",
+                "Content-Type": "application/json",
+            },
+        )
+    return _http_client
 
-def _client():
-    if not SENDGRID_API_KEY:
-        return None
-    try:
-        from sendgrid import SendGridAPIClient
-        return SendGridAPIClient(SENDGRID_API_KEY)
-    except Exception as e:
-        logger.warning("SendGrid not available: %s", e)
-        return None
 
+async def aclose() -> None:
+    """Close the shared SendGrid HTTP client (call on application shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
-def _send(to_email: str, subject: str, html_content: str, plain_content: str = "") -> bool:
+
+def _mail_body(personalizations: list[dict[str, Any]], subject: str, html_content: str, plain_content: str) -> bytes:
+    """SendGrid v3 /mail/send body; text/plain must precede text/html."""
+    return orjson.dumps({
+        "personalizations": personalizations,
+        "from": _FROM,
+        "subject": subject,
+        "content": [
+            {"type": "text/plain", "value": plain_content},
+            {"type": "text/html", "value": html_content},
+        ],
+    })
+
+
+async def _post(client: httpx.AsyncClient, body: bytes) -> None:
+    async with _send_semaphore:
+        response = await client.post(SENDGRID_MAIL_SEND_URL, content=body)
+    response.raise_for_status()
+
+
+async def _send(to_email: str, subject: str, html_content: str, plain_content: str = "") -> bool:
     client = _client()
     if not client:
         logger.warning("SendGrid not configured; skipping email to %s", to_email)
         return False
     try:
-        from sendgrid.helpers.mail import Mail, Email, To, Content
-        message = Mail(
-            from_email=Email(SENDGRID_FROM_EMAIL, SENDGRID_FROM_NAME),
-            to_emails=To(to_email),
-            subject=subject,
-            plain_text_content=Content("text/plain", plain_content or subject),
-            html_content=Content("text/html", html_content),
-        )
-        client.send(message)
+        await _post(client, _mail_body(
+            [{"to": [{"email": to_email}]}], subject, html_content, plain_content or subject
+        ))
         logger.info("Email sent to %s subject=%r", to_email, subject)
         return True
     except Exception as e:
@@ -46,38 +88,156 @@ def _send(to_email: str, subject: str, html_content: str, plain_content: str = "
         return False
 
 
-def send_job_opportunity_email(
-    to_email: str,
-    full_name: str,
-    job_title: str,
-    job_description_md: str,
-    profile_summary: str,
-) -> bool:
-    """Email candidate: you have a job opportunity (job + profile). No interview link yet."""
-    logger.debug("send_job_opportunity_email to=%s job_title=%r", to_email, job_title)
-    subject = f"Job opportunity: {job_title}"
-    # Simple HTML template
-    jd_html = (job_description_md or "").replace("\n", "<br>\n")
-    profile_html = (profile_summary or "—").replace("\n", "<br>\n")
-    html = f"""
+_JOB_OPPORTUNITY_HTML = Template("""
     <!DOCTYPE html>
     <html>
     <body style="font-family: sans-serif; max-width: 640px; margin: 0 auto; padding: 20px;">
-    <p>Hi {full_name or 'Candidate'},</p>
+    <p>Hi $full_name,</p>
     <p>We have a job opportunity that matches your profile.</p>
-    <h2>{job_title}</h2>
-    <div style="white-space: pre-wrap;">{jd_html}</div>
+    <h2>$job_title</h2>
+    <div style="white-space: pre-wrap;">$jd_html</div>
     <h3>Your profile (as we have it)</h3>
-    <div style="white-space: pre-wrap;">{profile_html}</div>
-    <p>Log in to the <a href="{FRONTEND_BASE_URL}">Corto portal</a> to view this opportunity and swipe right if interested to receive your interview link.</p>
+    <div style="white-space: pre-wrap;">$profile_html</div>
+    <p>Log in to the <a href="$portal_url">Corto portal</a> to view this opportunity and swipe right if interested to receive your interview link.</p>
+    <p>— Corto Recruitment</p>
+    </body>
+    </html>
+    """)
+
+_INTERVIEW_LINK_HTML = Template("""
+    <!DOCTYPE html>
+    <html>
+    <body style="font-family: sans-serif; max-width: 640px; margin: 0 auto; padding: 20px;">
+    <p>Hi $full_name,</p>
+    <p>You expressed interest in <strong>$job_title</strong>. Here is your interview link:</p>
+    <p><a href="$interview_link" style="display: inline-block; padding: 12px 24px; background: #2563eb; color: white; text-decoration: none; border-radius: 8px;">Start interview</a></p>
+    <p>Or copy this URL: $interview_link</p>
     <p>— Corto Recruitment</p>
     </body>
     </html>
+    """)
+
+
+def _text_to_html(text: str) -> str:
+    """HTML-escape text and turn newlines into <br> in one split/join pass."""
+    return "<br>\n".join(html.escape(text).split("\n"))
+
+
+def _job_opportunity_html(full_name: str, job_title: str, jd_html: str, profile_html: str) -> str:
+    return _JOB_OPPORTUNITY_HTML.substitute(
+        full_name=full_name,
+        job_title=job_title,
+        jd_html=jd_html,
+        profile_html=profile_html,
+        portal_url=html.escape(FRONTEND_BASE_URL),
+    )
+
+
+def _job_opportunity_plain(job_title: str) -> str:
+    return f"Job opportunity: {job_title}\n\nLog in to {FRONTEND_BASE_URL} to view and respond."
+
+
+# SendGrid accepts up to 1000 personalizations per request and 10,000 bytes of substitutions per personalization
+_MAX_PERSONALIZATIONS = 1000
+_MAX_SUBSTITUTION_BYTES = 10_000
+_FULL_NAME_TAG = "-full_name-"
+_PROFILE_HTML_TAG = "-profile_html-"
+# One address, no display name or list separators; anything else makes SendGrid reject the whole request
+_EMAIL_RE = re.compile(r"[^@\s<>()\[\],;:\"]+@[^@\s<>()\[\],;:\"]+\.[^@\s<>()\[\],;:\"]+")
+# Responses that reject the request body itself; other failures (auth, rate limit, network) are not retried per recipient
+_BATCH_REJECTED_STATUSES = frozenset((400, 413))
+
+
+def _substitutions_size(substitutions: dict[str, str]) -> int:
+    return sum(len(k.encode("utf-8")) + len(v.encode("utf-8")) for k, v in substitutions.items())
+
+
+async def send_job_opportunity_emails_batch(
+    job_title: str,
+    job_description_md: str,
+    recipients: list[dict[str, Any]],
+) -> int:
+    """Email several candidates about one job with a single API request per 1000 recipients.
+
+    recipients: dicts with email, full_name, profile_summary. The shared body is sent once; each
+    recipient's name and profile are filled in through per-personalization substitutions.
+    Chunks are posted concurrently. Malformed addresses are skipped; recipients whose substitutions exceed
+    SendGrid's per-personalization limit, and every recipient of a chunk SendGrid rejects, are sent one email
+    each instead. Returns the number of recipients whose request was accepted.
     """
-    return _send(to_email, subject, html, plain_content=f"Job opportunity: {job_title}\n\nLog in to {FRONTEND_BASE_URL} to view and respond.")
+    personalizations: list[dict[str, Any]] = []
+    oversize: list[dict[str, Any]] = []
+    for r in recipients:
+        email = (r.get("email") or "").strip()
+        if not email:
+            continue
+        if not _EMAIL_RE.fullmatch(email):
+            logger.warning("Skipping job opportunity email to invalid address %r", email)
+            continue
+        substitutions = {
+            _FULL_NAME_TAG: html.escape(r.get("full_name") or "Candidate"),
+            _PROFILE_HTML_TAG: _text_to_html(r.get("profile_summary") or "—"),
+        }
+        if _substitutions_size(substitutions) > _MAX_SUBSTITUTION_BYTES:
+            oversize.append({"to": [{"email": email}], "substitutions": substitutions})
+        else:
+            personalizations.append({"to": [{"email": email}], "substitutions": substitutions})
+    if not personalizations and not oversize:
+        return 0
+    client = _client()
+    if not client:
+        logger.warning(
+            "SendGrid not configured; skipping %d job opportunity emails", len(personalizations) + len(oversize)
+        )
+        return 0
+    subject = f"Job opportunity: {job_title}"
+    job_title_html = html.escape(job_title)
+    jd_html = _text_to_html(job_description_md or "")
+    html_content = _job_opportunity_html(_FULL_NAME_TAG, job_title_html, jd_html, _PROFILE_HTML_TAG)
+    plain_content = _job_opportunity_plain(job_title)
+
+    async def send_one(personalization: dict[str, Any]) -> int:
+        # Substitutions rendered into the body, so no size limit applies
+        substitutions = personalization["substitutions"]
+        sent = await _send(
+            personalization["to"][0]["email"],
+            subject,
+            _job_opportunity_html(
+                substitutions[_FULL_NAME_TAG], job_title_html, jd_html, substitutions[_PROFILE_HTML_TAG]
+            ),
+            plain_content=plain_content,
+        )
+        return int(sent)
+
+    async def send_chunk(chunk: list[dict[str, Any]]) -> int:
+        try:
+            await _post(client, _mail_body(chunk, subject, html_content, plain_content))
+            logger.info("Job opportunity emails sent count=%d subject=%r", len(chunk), subject)
+            return len(chunk)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code not in _BATCH_REJECTED_STATUSES:
+                logger.exception("SendGrid batch send failed count=%d subject=%r: %s", len(chunk), subject, e)
+                return 0
+            logger.warning(
+                "SendGrid rejected batch count=%d subject=%r (%s); sending individually",
+                len(chunk), subject, e.response.status_code,
+            )
+            return sum(await asyncio.gather(*map(send_one, chunk)))
+        except Exception as e:
+            logger.exception("SendGrid batch send failed count=%d subject=%r: %s", len(chunk), subject, e)
+            return 0
+
+    sent = await asyncio.gather(
+        *(
+            send_chunk(personalizations[start:start + _MAX_PERSONALIZATIONS])
+            for start in range(0, len(personalizations), _MAX_PERSONALIZATIONS)
+        ),
+        *map(send_one, oversize),
+    )
+    return sum(sent)
 
 
-def send_interview_link_email(
+async def send_interview_link_email(
     to_email: str,
     full_name: str,
     job_title: str,
@@ -86,16 +246,9 @@ def send_interview_link_email(
     """Email candidate: interview link (after right swipe)."""
     logger.debug("send_interview_link_email to=%s job_title=%r", to_email, job_title)
     subject = f"Your interview link: {job_title}"
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <body style="font-family: sans-serif; max-width: 640px; margin: 0 auto; padding: 20px;">
-    <p>Hi {full_name or 'Candidate'},</p>
-    <p>You expressed interest in <strong>{job_title}</strong>. Here is your interview link:</p>
-    <p><a href="{interview_link}" style="display: inline-block; padding: 12px 24px; background: #2563eb; color: white; text-decoration: none; border-radius: 8px;">Start interview</a></p>
-    <p>Or copy this URL: {interview_link}</p>
-    <p>— Corto Recruitment</p>
-    </body>
-    </html>
-    """
-    return _send(to_email, subject, html, plain_content=f"Your interview link: {interview_link}")
+    html_content = _INTERVIEW_LINK_HTML.substitute(
+        full_name=html.escape(full_name or "Candidate"),
+        job_title=html.escape(job_title),
+        interview_link=html.escape(interview_link),
+    )
+    return await _send(to_email, subject, html_content, plain_content=f"Your interview link: {interview_link}")
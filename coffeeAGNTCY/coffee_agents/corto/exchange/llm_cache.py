@@ -0,0 +1,46 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+
+from common.llm import DEFAULT_GEMINI_MODEL
+from config.config import LLM_MODEL
+from database.llm_cache import LLM_CACHE_TTL, cache_key, get_cached_response, store_cached_responses
+from database.session import get_session
+
+# Bump when the resume mastermind's extraction prompt or output schema changes
+RESUME_INGEST_PROMPT_VERSION = "resume_ingest/1"
+# Interview opener (greeting + first question); the system prompt itself is part of the key
+INTERVIEW_OPENER_PROMPT_VERSION = "interview_opener/1"
+# Interview question preparation (interview mastermind), keyed by JD content and candidate profile
+INTERVIEW_QUESTIONS_PROMPT_VERSION = "interview_questions/1"
+# Interview transcript score (exchange LLM)
+INTERVIEW_SCORE_PROMPT_VERSION = "interview_score/1"
+# Job description markdown -> JD schema extraction (exchange LLM)
+JD_SCHEMA_PROMPT_VERSION = "jd_schema/1"
+# Employer "generate JD from a short prompt" (exchange LLM); JD_GEN_SYSTEM is part of the key
+JD_GENERATE_PROMPT_VERSION = "jd_generate/1"
+LLM_MODEL_ID = LLM_MODEL or DEFAULT_GEMINI_MODEL
+INTERVIEW_OPENER_CACHE_TTL = timedelta(hours=1)
+
+
+async def cached_call(
+    prompt_version: str,
+    inputs: tuple[bytes, ...],
+    compute: Callable[[], Awaitable[dict[str, Any] | None]],
+    ttl: timedelta = LLM_CACHE_TTL,
+) -> dict[str, Any] | None:
+    """Return the cached response for (prompt_version, model, inputs), else await compute() and cache a non-empty result.
+
+    For callers without a session of their own; each lookup/store uses a short-lived session so none is held across the LLM call.
+    """
+    key = cache_key(prompt_version, LLM_MODEL_ID, *inputs)
+    async with get_session() as session:
+        cached = await get_cached_response(session, key)
+    if cached is not None:
+        return cached
+    result = await compute()
+    if result:
+        await store_cached_responses(prompt_version, LLM_MODEL_ID, {key: result}, ttl)
+    return result
@@ -1,64 +1,90 @@
 import asyncio
-import io
-import json
+import base64
+import functools
+import heapq
 import logging
+import multiprocessing
+import os
+import re
 import secrets
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Annotated, Any
 
 from dotenv import load_dotenv
+import orjson
 from fastapi import Depends, FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
-from pydantic import BaseModel
-import uvicorn
-from pypdf import PdfReader
-from sqlalchemy import select
-
-try:
-    from docx import Document as DocxDocument
-except ImportError:
-    DocxDocument = None
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import case, func, insert, select, update
 
 from agntcy_app_sdk.factory import AgntcyFactory
-from ioa_observe.sdk.tracing import session_start
-from common.version import get_version_info
+from common import event_loop
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from config.logging_config import setup_logging
-from common.llm import get_llm, invoke_structured_with_retry, GenerateJDOutput, JobDescriptionExtractOutput
+from common.llm import get_llm, ainvoke_structured_with_retry, GenerateJDOutput
 from exchange.agent import ExchangeAgent
+from exchange import email_sendgrid
+from exchange.resume_text import EXTRACTORS as RESUME_TEXT_EXTRACTORS, DOCX_AVAILABLE
 from exchange.services import AgentClient
 from auth.service import AuthService
-from auth.deps import get_current_user, require_role
+from auth.deps import require_role
 from database.session import get_session, init_db
-from database.models import User, CandidateProfile, ResumeBlob, Job, JobCandidate, InterviewSession
+from database.candidate_index import sync_candidate_index
+from database.llm_cache import cache_key, delete_cached_response, get_cached_response, store_cached_responses
+from exchange.llm_cache import (
+    INTERVIEW_OPENER_CACHE_TTL,
+    INTERVIEW_OPENER_PROMPT_VERSION,
+    INTERVIEW_QUESTIONS_PROMPT_VERSION,
+    JD_GENERATE_PROMPT_VERSION,
+    LLM_MODEL_ID,
+    RESUME_INGEST_PROMPT_VERSION,
+    cached_call,
+)
+from database.models import CandidateProfile, ResumeBlob, Job, JobCandidate, InterviewSession
 from schemas import JD_SCHEMA_JSON, job_description_to_markdown, resume_schema_to_profile
 
 # Directory for interview recordings (relative to cwd when running exchange)
 RECORDINGS_DIR = Path(__file__).resolve().parent.parent / "recordings"
 # Base path for trylipsync (interviewer image, checkpoint, etc.)
 TRYLIPSYNC_BASE = Path(__file__).resolve().parent.parent / "trylipsync"
+MAX_RESUME_SIZE_MB = 10
+# Uploads stay in memory up to this size, then roll over to a temp file
+_UPLOAD_SPOOL_MAX_BYTES = 2 * 1024 * 1024
+_UPLOAD_CHUNK_BYTES = 1 << 16
+RESUME_EXTRACT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+# A question line starts with a digit ("1. ...") or a dash ("- ..."); the whole stripped line is kept
+_QUESTION_LINE_RE = re.compile(r"^[ \t]*([\d-].*?)[ \t\r]*$", re.MULTILINE)
 
 
 def _parse_questions_from_agent(questions_text: str | None) -> list[str]:
     """Parse agent response into list of question strings (max 10)."""
-    if not (questions_text or "").strip():
+    text = (questions_text or "").strip()
+    if not text:
         return []
-    lines = (questions_text or "").strip().split("\n")
-    questions = [
-        line.strip()
-        for line in lines
-        if line.strip() and (line.strip()[0].isdigit() or line.strip().startswith("-"))
-    ]
+    questions = _QUESTION_LINE_RE.findall(text)
     if not questions:
-        questions = [q.strip() for q in lines if q.strip()][:10]
+        questions = [q for q in map(str.strip, text.splitlines()) if q]
     return questions[:10]
 
 
+# TTS + Wav2Lip renders in flight across all interviews in this process
+QUESTION_VIDEO_CONCURRENCY = int(os.getenv("QUESTION_VIDEO_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+_question_video_semaphore = asyncio.Semaphore(QUESTION_VIDEO_CONCURRENCY)
+# Completed question videos persisted per UPDATE while an interview's set is still rendering
+_QUESTION_VIDEO_SAVE_EVERY = 3
+
+
 async def _background_generate_question_videos(token: str, questions: list[str]) -> None:
     """Generate lipsync videos for each question (TTS + Wav2Lip), save under RECORDINGS_DIR/interview/<token>/, update session.question_videos."""
     if not questions:
@@ -70,32 +96,67 @@ async def _background_generate_question_videos(token: str, questions: list[str])
         return
     video_dir = RECORDINGS_DIR / "interview" / token
     video_dir.mkdir(parents=True, exist_ok=True)
-    paths: list[str] = []
-    for i, q in enumerate(questions):
-        try:
-            out_path = video_dir / f"q{i}.mp4"
-            await asyncio.to_thread(
-                generate_question_video,
-                q,
-                out_path,
-                base_dir=TRYLIPSYNC_BASE,
-                use_openai_tts=True,
-            )
-            paths.append(f"interview/{token}/q{i}.mp4")
-        except Exception as e:
-            logger.exception("Question video %s generation failed: %s", i, e)
-    if not paths:
-        return
-    async with get_session() as session:
-        inv = (
+
+    async def generate(i: int, q: str) -> tuple[int, str | None]:
+        async with _question_video_semaphore:
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    app.state.video_pool,
+                    functools.partial(
+                        generate_question_video,
+                        q,
+                        video_dir / f"q{i}.mp4",
+                        base_dir=TRYLIPSYNC_BASE,
+                        use_openai_tts=True,
+                    ),
+                )
+                return i, f"interview/{token}/q{i}.mp4"
+            except Exception as e:
+                logger.exception("Question video %s generation failed: %s", i, e)
+                return i, None
+
+    async def store(done: dict[int, str]) -> None:
+        async with get_session() as session:
             await session.execute(
-                select(InterviewSession).where(InterviewSession.interview_link_token == token)
+                update(InterviewSession)
+                .where(InterviewSession.interview_link_token == token)
+                .values(question_videos=[done[i] for i in sorted(done)])
             )
-        ).scalar_one_or_none()
-        if inv:
-            inv.question_videos = paths
             await session.commit()
 
+    # Questions are independent; finished videos are saved every few completions (in question order),
+    # so a join sees them early and a crash keeps what was already rendered
+    done: dict[int, str] = {}
+    unsaved = 0
+    for next_done in asyncio.as_completed([generate(i, q) for i, q in enumerate(questions)]):
+        i, path = await next_done
+        if path:
+            done[i] = path
+            unsaved += 1
+        if unsaved >= _QUESTION_VIDEO_SAVE_EVERY:
+            await store(done)
+            unsaved = 0
+    if unsaved:
+        await store(done)
+
+
+# Strong references to fire-and-forget tasks: the loop only keeps weak ones, so untracked tasks can be GC'd mid-run
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _on_background_task_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background task %s failed", task.get_name(), exc_info=task.exception())
+
+
+def _spawn_background(coro, name: str) -> asyncio.Task:
+    task = asyncio.create_task(coro, name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_task_done)
+    return task
+
+
 setup_logging()
 logger = logging.getLogger("corto.exchange.main")
 load_dotenv()
@@ -109,14 +170,56 @@ auth_service = AuthService()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    # pypdf is pure-Python and CPU-bound: parse resumes in worker processes, not on the event loop.
+    # spawn keeps workers from inheriting this process's threads and open sockets. Spawned workers re-import the
+    # parent's __main__, so the server is started through the import-safe launcher (python -m exchange), not this module.
+    app.state.extract_pool = ProcessPoolExecutor(
+        max_workers=RESUME_EXTRACT_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    # Dedicated threads for video renders so they never starve the default executor (asyncio.to_thread)
+    app.state.video_pool = ThreadPoolExecutor(max_workers=QUESTION_VIDEO_CONCURRENCY, thread_name_prefix="question-video")
     yield
+    app.state.video_pool.shutdown(wait=False, cancel_futures=True)
+    app.state.extract_pool.shutdown(wait=False, cancel_futures=True)
+    await email_sendgrid.aclose()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 # Serve interview recordings (create dir if missing)
 RECORDINGS_DIR.mkdir(parents=True, exist_ok=True)
 from fastapi.staticfiles import StaticFiles
 app.mount("/recordings", StaticFiles(directory=str(RECORDINGS_DIR)), name="recordings")
+_RESUME_UPLOAD_PATHS = frozenset(("/candidate/resume/upload", "/agent/extract-resume"))
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class ResumeUploadSizeLimit:
+    """Reject oversize resume uploads from Content-Length before FastAPI parses the multipart form.
+
+    Plain ASGI rather than BaseHTTPMiddleware: only the upload paths are inspected, every other request
+    (streamed downloads included) is passed straight through.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.max_body_bytes = MAX_RESUME_SIZE_MB * 1024 * 1024 + _MULTIPART_OVERHEAD_BYTES
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"] in _RESUME_UPLOAD_PATHS:
+            content_length = dict(scope["headers"]).get(b"content-length", b"")
+            if content_length.isdigit() and int(content_length) > self.max_body_bytes:
+                response = ORJSONResponse(
+                    {"detail": f"File too large. Max size: {MAX_RESUME_SIZE_MB} MB"},
+                    status_code=413,
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+# Added before CORS so CORS wraps it and the 413 still carries CORS headers
+app.add_middleware(ResumeUploadSizeLimit)
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -128,7 +231,7 @@ app.add_middleware(
 
 exchange_agent = ExchangeAgent(factory=factory)
 
-ALLOWED_RESUME_EXTENSIONS = {".pdf", ".docx"}
+ALLOWED_RESUME_EXTENSIONS = frozenset(RESUME_TEXT_EXTRACTORS)
 
 
 # ---------- Agent discovery (HTTP) ----------
@@ -152,12 +255,9 @@ async def well_known_agent_card(request: Request):
         "supportsAuthenticatedExtendedCard": False,
     }
     return Response(
-        content=json.dumps(card, indent=2),
+        content=orjson.dumps(card, option=orjson.OPT_INDENT_2),
         media_type="application/json",
     )
-MAX_RESUME_SIZE_MB = 10
-
-
 # ---------- Auth ----------
 class RegisterRequest(BaseModel):
     username: str
@@ -193,15 +293,17 @@ _PROFILE_KEYS = (
     "certifications", "interests", "projects",
 )
 _LIST_KEYS = frozenset(("education", "work_experience", "skills", "languages", "certifications", "interests", "projects"))
+_PROFILE_COLUMNS = tuple(getattr(CandidateProfile, k) for k in _PROFILE_KEYS)
 
 
 @app.post("/candidate/resume/upload")
 async def candidate_upload_resume(
+    request: Request,
     user: Annotated[dict, Depends(require_role("candidate"))],
     file: UploadFile = File(...),
 ):
     """Upload resume; extract text, call resume mastermind, store profile + last resume."""
-    user_id = int(user.get("user_id", 0))
+    user_id = user["user_id"]
     filename = file.filename or "resume"
     logger.info("Resume upload started: user_id=%s filename=%s", user_id, filename)
 
@@ -212,41 +314,50 @@ async def candidate_upload_resume(
             status_code=400,
             detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_RESUME_EXTENSIONS)}",
         )
-    content = await file.read()
-    size_mb = len(content) / (1024 * 1024)
-    if len(content) > MAX_RESUME_SIZE_MB * 1024 * 1024:
-        logger.warning("Resume upload rejected: file too large size_mb=%.2f user_id=%s", size_mb, user_id)
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Max size: {MAX_RESUME_SIZE_MB} MB",
-        )
-    logger.debug("Resume upload: extracting text suffix=%s size_bytes=%s user_id=%s", suffix, len(content), user_id)
+    with await _spool_resume_upload(file) as spool:
+        size = spool.tell()
+        logger.debug("Resume upload: extracting text suffix=%s size_bytes=%s user_id=%s", suffix, size, user_id)
+        # Read back once: the bytes go to the extraction worker and the ResumeBlob column
+        spool.seek(0)
+        content = spool.read()
     try:
-        text = _extract_text_pdf(content) if suffix == ".pdf" else _extract_text_docx(content)
+        text = await _extract_resume_text(request, suffix, content)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Resume extraction failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to extract text: {e}") from e
     logger.info("Resume text extracted: user_id=%s text_len=%s", user_id, len(text))
 
     logger.info("Resume upload: calling resume_ingest user_id=%s text_len=%s", user_id, len(text))
-    print(text)
-    result = await agent_client.resume_ingest(text)
-    print(result)
-    result_keys = list(result.keys()) if isinstance(result, dict) else []
-    logger.info("Resume upload: resume_ingest returned keys=%s user_id=%s", result_keys, user_id)
-
+    # Identical files (re-uploads, shared PDFs) reuse the stored extraction instead of another LLM call
+    ingest_key = cache_key(RESUME_INGEST_PROMPT_VERSION, LLM_MODEL_ID, content)
+    async with get_session() as session:
+        result = await get_cached_response(session, ingest_key)
+    ingest_cached = result is not None
+    if ingest_cached:
+        logger.info("Resume upload: resume_ingest cache hit user_id=%s", user_id)
+    else:
+        result = await agent_client.resume_ingest(text)
     resume_schema = result.get("resume") or {}
     agent_profile_raw = result.get("profile")
-    logger.info(
-        "Resume upload: resume_schema keys=%s profile type=%s user_id=%s",
-        list(resume_schema.keys()) if isinstance(resume_schema, dict) else type(resume_schema).__name__,
-        type(agent_profile_raw).__name__ if agent_profile_raw is not None else "None",
-        user_id,
-    )
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug(
+            "Resume upload: resume_ingest returned keys=%s resume_schema keys=%s profile type=%s user_id=%s",
+            list(result) if isinstance(result, dict) else [],
+            list(resume_schema) if isinstance(resume_schema, dict) else type(resume_schema).__name__,
+            type(agent_profile_raw).__name__,
+            user_id,
+        )
 
     profile_data = resume_schema_to_profile(resume_schema)
-    profile_data_filled = [k for k in _PROFILE_KEYS if profile_data.get(k) not in (None, [], {})]
-    logger.info("Resume upload: profile_data filled keys=%s user_id=%s", profile_data_filled, user_id)
+    if debug:
+        logger.debug(
+            "Resume upload: profile_data filled keys=%s user_id=%s",
+            [k for k in _PROFILE_KEYS if profile_data.get(k) not in (None, [], {})],
+            user_id,
+        )
 
     agent_profile = agent_profile_raw if isinstance(agent_profile_raw, dict) else {}
     merged = 0
@@ -261,8 +372,8 @@ async def candidate_upload_resume(
     for k in _PROFILE_KEYS:
         v = profile_data.get(k)
         data[k] = (v if isinstance(v, list) else []) if k in _LIST_KEYS else v
-    profile_autofilled = any(data.get(k) for k in ("full_name", "email", "summary", "skills"))
     autofill_keys = [k for k in ("full_name", "email", "summary", "skills") if data.get(k)]
+    profile_autofilled = bool(autofill_keys)
     logger.info(
         "Resume upload: profile_autofilled=%s autofill_keys=%s user_id=%s",
         profile_autofilled,
@@ -282,8 +393,11 @@ async def candidate_upload_resume(
                         setattr(row, k, v)
                     logger.info("Resume upload: updated CandidateProfile user_id=%s", user_id)
                 else:
-                    session.add(CandidateProfile(user_id=user_id, **data))
+                    row = CandidateProfile(user_id=user_id, **data)
+                    session.add(row)
+                    await session.flush()
                     logger.info("Resume upload: created CandidateProfile user_id=%s", user_id)
+                await sync_candidate_index(session, row)
 
             logger.debug("Resume upload: adding ResumeBlob user_id=%s file_name=%s", user_id, filename)
             session.add(ResumeBlob(
@@ -299,6 +413,9 @@ async def candidate_upload_resume(
     except Exception as e:
         logger.exception("Resume upload: DB failed user_id=%s filename=%s error=%s", user_id, filename, e)
         raise
+    # Only after the upload is committed, and in a session of its own: a failed cache write never loses the upload
+    if not ingest_cached and resume_schema:
+        await store_cached_responses(RESUME_INGEST_PROMPT_VERSION, LLM_MODEL_ID, {ingest_key: result})
 
     logger.info("Resume upload completed: user_id=%s filename=%s profile_autofilled=%s", user_id, filename, profile_autofilled)
 
@@ -314,23 +431,12 @@ async def candidate_get_profile(
     user: Annotated[dict, Depends(require_role("candidate"))],
 ):
     async with get_session() as session:
-        row = (await session.execute(select(CandidateProfile).where(CandidateProfile.user_id == int(user["user_id"])))).scalar_one_or_none()
-        if not row:
-            return None
-        return {
-            "full_name": row.full_name,
-            "email": row.email,
-            "phone": row.phone,
-            "address": row.address,
-            "summary": row.summary,
-            "education": row.education or [],
-            "work_experience": row.work_experience or [],
-            "skills": row.skills or [],
-            "languages": row.languages or [],
-            "certifications": row.certifications or [],
-            "interests": row.interests or [],
-            "projects": row.projects or [],
-        }
+        row = (
+            await session.execute(select(*_PROFILE_COLUMNS).where(CandidateProfile.user_id == user["user_id"]))
+        ).mappings().one_or_none()
+    if not row:
+        return None
+    return {k: (v or []) if k in _LIST_KEYS else v for k, v in row.items()}
 
 
 @app.put("/candidate/profile")
@@ -339,14 +445,15 @@ async def candidate_update_profile(
     user: Annotated[dict, Depends(require_role("candidate"))],
 ):
     async with get_session() as session:
-        row = (await session.execute(select(CandidateProfile).where(CandidateProfile.user_id == int(user["user_id"])))).scalar_one_or_none()
+        row = (await session.execute(select(CandidateProfile).where(CandidateProfile.user_id == user["user_id"]))).scalar_one_or_none()
         if not row:
             raise HTTPException(status_code=404, detail="Profile not found. Upload a resume first.")
         for k in ("full_name", "email", "phone", "address", "summary", "education", "work_experience", "skills", "languages", "certifications", "interests", "projects"):
             if k in body and body[k] is not None:
                 setattr(row, k, body[k])
+        if body.get("skills") is not None or body.get("languages") is not None:
+            await sync_candidate_index(session, row)
         await session.commit()
-        await session.refresh(row)
         return {"message": "Profile updated."}
 
 
@@ -358,7 +465,7 @@ async def candidate_last_resume(
         row = (
             await session.execute(
                 select(ResumeBlob)
-                .where(ResumeBlob.user_id == int(user["user_id"]))
+                .where(ResumeBlob.user_id == user["user_id"])
                 .order_by(ResumeBlob.created_at.desc())
                 .limit(1)
             )
@@ -375,63 +482,53 @@ async def candidate_last_resume_pdf(
 ):
     """Return the last uploaded resume as PDF for in-browser display. 404 if not PDF or missing."""
     async with get_session() as session:
-        row = (
+        # Metadata and size only; the bytes are streamed below in chunks
+        r = (
             await session.execute(
-                select(ResumeBlob)
-                .where(ResumeBlob.user_id == int(user["user_id"]))
+                select(
+                    ResumeBlob.id,
+                    ResumeBlob.file_name,
+                    ResumeBlob.content_type,
+                    func.length(ResumeBlob.file_content).label("size"),
+                )
+                .where(ResumeBlob.user_id == user["user_id"])
                 .order_by(ResumeBlob.created_at.desc())
                 .limit(1)
             )
-        )
-        r = row.scalar_one_or_none()
-        if not r or not r.file_content:
-            raise HTTPException(status_code=404, detail="No resume file found.")
-        ct = (r.content_type or "").lower()
-        if "pdf" not in ct and not (r.file_name or "").lower().endswith(".pdf"):
-            raise HTTPException(status_code=404, detail="Last resume is not a PDF.")
-        return Response(
-            content=r.file_content,
-            media_type="application/pdf",
-            headers={"Content-Disposition": "inline; filename=\"" + (r.file_name or "resume.pdf") + "\""},
-        )
+        ).one_or_none()
+    if not r or not r.size:
+        raise HTTPException(status_code=404, detail="No resume file found.")
+    ct = (r.content_type or "").lower()
+    if "pdf" not in ct and not (r.file_name or "").lower().endswith(".pdf"):
+        raise HTTPException(status_code=404, detail="Last resume is not a PDF.")
+    return StreamingResponse(
+        _stream_resume_blob(r.id, r.size),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": "inline; filename=\"" + (r.file_name or "resume.pdf") + "\"",
+            "Content-Length": str(r.size),
+        },
+    )
 
 
-# ---------- Candidate interviews (list + swipe respond) ----------
-@app.get("/candidate/interviews")
-async def candidate_list_interviews(
-    user: Annotated[dict, Depends(require_role("candidate"))],
-):
-    """List all interviews for the candidate: open (pending swipe) and history with decision status."""
-    user_id = int(user["user_id"])
+_RESUME_STREAM_CHUNK_BYTES = 1 << 20
+
+
+async def _stream_resume_blob(blob_id: int, size: int):
+    """Yield a stored resume file in chunks read with SQL substr, so the whole blob is never held in memory."""
     async with get_session() as session:
-        profile = (
-            await session.execute(
-                select(CandidateProfile).where(CandidateProfile.user_id == user_id)
-            )
-        ).scalar_one_or_none()
-        if not profile:
-            return {"open": [], "history": []}
-        jc_list = (
-            await session.execute(
-                select(JobCandidate, Job, InterviewSession)
-                .join(Job, JobCandidate.job_id == Job.id)
-                .outerjoin(
-                    InterviewSession,
-                    InterviewSession.job_candidate_id == JobCandidate.id,
+        for offset in range(0, size, _RESUME_STREAM_CHUNK_BYTES):
+            yield (
+                await session.execute(
+                    select(func.substr(ResumeBlob.file_content, offset + 1, _RESUME_STREAM_CHUNK_BYTES))
+                    .where(ResumeBlob.id == blob_id)
                 )
-                .where(JobCandidate.candidate_profile_id == profile.id)
-                .order_by(JobCandidate.id.desc())
-            )
-        ).all()
-        open_list = []
-        history_list = []
-        for jc, job, inv in jc_list:
-            inv_token = inv.interview_link_token if inv else None
-            item = {
-                "job_candidate_id": jc.id,
-                "job_id": job.id,
-                "job_title": job.title,
-                "description_md": job.description_md or """# AI Engineer
+            ).scalar_one()
+
+
+# ---------- Candidate interviews (list + swipe respond) ----------
+# Shown for jobs published without a description
+_DEFAULT_JD_MD = """# AI Engineer
 
 **Location:** [City, Country / Remote]  
 **Job Type:** [Full-Time / Part-Time / Contract]
@@ -455,29 +552,66 @@ We are looking for an **AI Engineer** to design, develop, and deploy AI/ML model
 - Experience with NLP, computer vision, or generative AI.  
 - Familiarity with MLOps and production deployment.  
 - Strong problem-solving and teamwork skills.
-""",
-                "invited_at": jc.invited_at.isoformat() if jc.invited_at else None,
-                "interview_completed_at": (
-                    jc.interview_completed_at.isoformat() if jc.interview_completed_at else None
-                ),
-                "score": jc.score,
-                "interview_link_token": inv_token,
-                "candidate_decision": jc.candidate_decision,
-                "company_decision": jc.company_decision,
-            }
-            if jc.candidate_decision is None:
-                open_list.append(item)
-            else:
-                status = "candidate_rejected"
-                if jc.company_decision == "placed":
-                    status = "placed"
-                elif jc.company_decision == "rejected":
-                    status = "company_rejected"
-                elif jc.candidate_decision == "interested":
-                    status = "interested"  # pending company
-                item["status"] = status
-                history_list.append(item)
-        return {"open": open_list, "history": history_list}
+"""
+
+# History status for a swiped interview; NULL while the candidate has not responded (open)
+_INTERVIEW_HISTORY_STATUS = case(
+    (JobCandidate.candidate_decision.is_(None), None),
+    (JobCandidate.company_decision == "placed", "placed"),
+    (JobCandidate.company_decision == "rejected", "company_rejected"),
+    (JobCandidate.candidate_decision == "interested", "interested"),
+    else_="candidate_rejected",
+).label("status")
+
+
+_INTERVIEW_LIST_PARTITION = 500
+
+
+@app.get("/candidate/interviews")
+async def candidate_list_interviews(
+    user: Annotated[dict, Depends(require_role("candidate"))],
+):
+    """List all interviews for the candidate: open (pending swipe) and history with decision status."""
+    user_id = user["user_id"]
+    open_list = []
+    history_list = []
+    async with get_session() as session:
+        # Streamed in partitions so raw rows never pile up alongside the response items
+        result = await session.stream(
+            # Labelled columns map straight onto the response items
+            select(
+                JobCandidate.id.label("job_candidate_id"),
+                Job.id.label("job_id"),
+                Job.title.label("job_title"),
+                func.coalesce(func.nullif(Job.description_md, ""), _DEFAULT_JD_MD).label("description_md"),
+                JobCandidate.invited_at,
+                JobCandidate.interview_completed_at,
+                JobCandidate.score,
+                InterviewSession.interview_link_token,
+                JobCandidate.candidate_decision,
+                JobCandidate.company_decision,
+                _INTERVIEW_HISTORY_STATUS,
+            )
+            .join(Job, JobCandidate.job_id == Job.id)
+            .join(CandidateProfile, CandidateProfile.id == JobCandidate.candidate_profile_id)
+            .outerjoin(
+                InterviewSession,
+                InterviewSession.job_candidate_id == JobCandidate.id,
+            )
+            .where(CandidateProfile.user_id == user_id)
+            .order_by(JobCandidate.id.desc())
+        )
+        async for partition in result.mappings().partitions(_INTERVIEW_LIST_PARTITION):
+            for row in partition:
+                item = dict(row)
+                # Open items (no decision yet) carry no status key
+                if item["status"] is None:
+                    del item["status"]
+                    open_list.append(item)
+                else:
+                    history_list.append(item)
+    # Returned as a response so orjson encodes the datetimes directly (same ISO strings), skipping jsonable_encoder
+    return ORJSONResponse({"open": open_list, "history": history_list})
 
 
 class InterviewRespondRequest(BaseModel):
@@ -491,25 +625,27 @@ async def candidate_respond_to_interview(
     user: Annotated[dict, Depends(require_role("candidate"))],
 ):
     """Record candidate swipe: interested (right) or rejected (left). If interested, send interview link email."""
-    user_id = int(user["user_id"])
+    user_id = user["user_id"]
     async with get_session() as session:
-        profile = (
-            await session.execute(
-                select(CandidateProfile).where(CandidateProfile.user_id == user_id)
-            )
-        ).scalar_one_or_none()
-        if not profile:
-            raise HTTPException(status_code=404, detail="Profile not found")
-        jc = (
+        # Job and InterviewSession ride along (outer joins) so the swipe-right path needs no second SELECT
+        row = (
             await session.execute(
-                select(JobCandidate).where(
+                select(JobCandidate, CandidateProfile, Job, InterviewSession)
+                .join(CandidateProfile, CandidateProfile.id == JobCandidate.candidate_profile_id)
+                .outerjoin(Job, Job.id == JobCandidate.job_id)
+                .outerjoin(InterviewSession, InterviewSession.job_candidate_id == JobCandidate.id)
+                .where(
                     JobCandidate.id == job_candidate_id,
-                    JobCandidate.candidate_profile_id == profile.id,
+                    CandidateProfile.user_id == user_id,
                 )
             )
-        ).scalar_one_or_none()
-        if not jc:
-            raise HTTPException(status_code=404, detail="Interview not found")
+        ).one_or_none()
+        if not row:
+            has_profile = (
+                await session.execute(select(CandidateProfile.id).where(CandidateProfile.user_id == user_id))
+            ).scalar_one_or_none()
+            raise HTTPException(status_code=404, detail="Interview not found" if has_profile else "Profile not found")
+        jc, cp, job, inv = row
         if jc.candidate_decision is not None:
             raise HTTPException(
                 status_code=400,
@@ -520,28 +656,13 @@ async def candidate_respond_to_interview(
 
         # If swipe right: prepare questions, store them, send email, then generate question videos in background
         if body.interested:
-            job = (
-                await session.execute(select(Job).where(Job.id == jc.job_id))
-            ).scalar_one_or_none()
-            inv = (
-                await session.execute(
-                    select(InterviewSession).where(InterviewSession.job_candidate_id == jc.id)
-                )
-            ).scalar_one_or_none()
-            cp = (
-                await session.execute(
-                    select(CandidateProfile).where(CandidateProfile.id == jc.candidate_profile_id)
-                )
-            ).scalar_one_or_none()
-            if job and inv and cp:
+            if job and inv:
                 # Prepare questions now (so they're ready when candidate joins)
-                questions_text = await agent_client.interview_prepare_questions(
-                    _job_content_for_agent(job), _candidate_profile_for_agent(cp)
-                )
-                questions = _parse_questions_from_agent(questions_text)
+                questions = await _prepare_questions(session, job, cp)
                 if questions:
                     inv.questions = questions
-                    await session.commit()
+                inv.cached_system_prompt = _interview_system_prompt(job, cp, (inv.questions or [])[:10])
+                await session.commit()
                 if cp.email:
                     await agent_client.interview_send_invites(
                         job_id=job.id,
@@ -557,7 +678,10 @@ async def candidate_respond_to_interview(
                     )
                 # Generate lipsync videos in background (TTS + Wav2Lip)
                 if questions:
-                    asyncio.create_task(_background_generate_question_videos(inv.interview_link_token, questions))
+                    _spawn_background(
+                        _background_generate_question_videos(inv.interview_link_token, questions),
+                        name=f"question-videos-{jc.id}",
+                    )
     return {"message": "Response recorded", "interested": body.interested}
 
 
@@ -568,45 +692,36 @@ async def interview_join(token: str):
     if not token or not token.strip():
         raise HTTPException(status_code=400, detail="Token is required.")
     async with get_session() as session:
-        inv = (
+        # One round-trip; outer joins keep the per-entity error messages below
+        row = (
             await session.execute(
-                select(InterviewSession).where(InterviewSession.interview_link_token == token.strip())
+                select(InterviewSession, JobCandidate, Job, CandidateProfile)
+                .outerjoin(JobCandidate, JobCandidate.id == InterviewSession.job_candidate_id)
+                .outerjoin(Job, Job.id == JobCandidate.job_id)
+                .outerjoin(CandidateProfile, CandidateProfile.id == JobCandidate.candidate_profile_id)
+                .where(InterviewSession.interview_link_token == token.strip())
             )
-        ).scalar_one_or_none()
-        if not inv:
+        ).one_or_none()
+        if not row:
             raise HTTPException(status_code=404, detail="Invalid or expired interview link.")
-        jc = (
-            await session.execute(
-                select(JobCandidate).where(JobCandidate.id == inv.job_candidate_id)
-            )
-        ).scalar_one_or_none()
+        inv, jc, job, cp = row
         if not jc:
             raise HTTPException(status_code=404, detail="Interview session not found.")
         if jc.interview_completed_at:
             raise HTTPException(status_code=400, detail="This interview has already been completed.")
-        job = (
-            await session.execute(select(Job).where(Job.id == jc.job_id))
-        ).scalar_one_or_none()
         if not job:
             raise HTTPException(status_code=404, detail="Job not found.")
-        cp = (
-            await session.execute(
-                select(CandidateProfile).where(CandidateProfile.id == jc.candidate_profile_id)
-            )
-        ).scalar_one_or_none()
         if not cp:
             raise HTTPException(status_code=404, detail="Candidate not found.")
         # Use pre-generated questions if available (from swipe), else prepare now
         if inv.questions and isinstance(inv.questions, list) and len(inv.questions) > 0:
             questions = inv.questions[:10]
         else:
-            questions_text = await agent_client.interview_prepare_questions(
-                _job_content_for_agent(job), _candidate_profile_for_agent(cp)
-            )
-            questions = _parse_questions_from_agent(questions_text)
+            questions = await _prepare_questions(session, job, cp)
             if questions:
                 inv.questions = questions
-                await session.commit()
+        inv.cached_system_prompt = _interview_system_prompt(job, cp, questions[:10])
+        await session.commit()
         question_video_urls = []
         if inv.question_videos and isinstance(inv.question_videos, list):
             question_video_urls = [f"/recordings/{p}" for p in inv.question_videos]
@@ -629,21 +744,20 @@ class InterviewStartRequest(BaseModel):
 @app.post("/interview/start")
 async def interview_start(body: InterviewStartRequest):
     """Record interview start time. No auth required."""
+    token = body.token.strip()
     async with get_session() as session:
-        inv = (
-            await session.execute(
-                select(InterviewSession).where(
-                    InterviewSession.interview_link_token == body.token.strip()
-                )
-            )
-        ).scalar_one_or_none()
-        if not inv:
-            raise HTTPException(status_code=404, detail="Invalid or expired interview link.")
-        if inv.started_at:
-            pass
-        else:
-            inv.started_at = datetime.now(timezone.utc)
+        # First start is a single conditional UPDATE; only a no-op update needs a lookup to tell "already started" from "unknown token"
+        result = await session.execute(
+            update(InterviewSession)
+            .where(InterviewSession.interview_link_token == token, InterviewSession.started_at.is_(None))
+            .values(started_at=datetime.now(timezone.utc))
+        )
+        if result.rowcount:
             await session.commit()
+        elif (
+            await session.execute(select(InterviewSession.id).where(InterviewSession.interview_link_token == token))
+        ).scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Invalid or expired interview link.")
     return {"message": "Interview started."}
 
 
@@ -658,47 +772,36 @@ async def interview_chat(body: InterviewChatRequest):
     """Get next interviewer message from interview mastermind (JD + resume + questions, ~10 min conversation). No auth."""
     if not body.token or not body.token.strip():
         raise HTTPException(status_code=400, detail="Token is required.")
-    jd_content = ""
-    profile_content = "{}"
-    questions: list[str] = []
     async with get_session() as session:
-        inv = (
+        row = (
             await session.execute(
-                select(InterviewSession).where(
-                    InterviewSession.interview_link_token == body.token.strip()
-                )
+                select(InterviewSession, JobCandidate.id, JobCandidate.interview_completed_at)
+                .outerjoin(JobCandidate, JobCandidate.id == InterviewSession.job_candidate_id)
+                .where(InterviewSession.interview_link_token == body.token.strip())
             )
-        ).scalar_one_or_none()
-        if not inv:
+        ).one_or_none()
+        if not row:
             raise HTTPException(status_code=404, detail="Invalid or expired interview link.")
-        jc = (
-            await session.execute(
-                select(JobCandidate).where(JobCandidate.id == inv.job_candidate_id)
-            )
-        ).scalar_one_or_none()
-        if not jc or jc.interview_completed_at:
+        inv, jc_id, completed_at = row
+        if jc_id is None or completed_at:
             raise HTTPException(status_code=400, detail="Interview already completed.")
-        job = (
-            await session.execute(select(Job).where(Job.id == jc.job_id))
-        ).scalar_one_or_none()
-        cp = (
-            await session.execute(
-                select(CandidateProfile).where(CandidateProfile.id == jc.candidate_profile_id)
-            )
-        ).scalar_one_or_none()
-        if not job or not cp:
-            raise HTTPException(status_code=404, detail="Job or candidate not found.")
-        jd_content = _job_content_for_agent(job)
-        profile_content = json.dumps(_candidate_profile_for_agent(cp), indent=0)
-        questions = (inv.questions or [])[:10]
-    questions_text = "\n".join(f"{i+1}. {q}" for i, q in enumerate(questions)) if questions else "Ask role-specific and behavioral questions."
-    system = (
-        "You are the interviewer in a live 10-minute video interview. Use the job description and candidate profile to ask "
-        "relevant questions. Cover the suggested questions naturally; follow up on the candidate's answers. "
-        "Keep each response to 1-3 sentences. Be professional and concise.\n\n"
-        f"Job description:\n{jd_content[:3000]}\n\nCandidate profile:\n{profile_content[:2000]}\n\n"
-        f"Suggested questions to cover:\n{questions_text}"
-    )
+        system = inv.cached_system_prompt
+        if not system:
+            # Sessions joined before the prompt was cached: build it once and store it
+            row = (
+                await session.execute(
+                    select(Job, CandidateProfile)
+                    .join(JobCandidate, JobCandidate.job_id == Job.id)
+                    .join(CandidateProfile, CandidateProfile.id == JobCandidate.candidate_profile_id)
+                    .where(JobCandidate.id == jc_id)
+                )
+            ).one_or_none()
+            if not row:
+                raise HTTPException(status_code=404, detail="Job or candidate not found.")
+            job, cp = row
+            system = _interview_system_prompt(job, cp, (inv.questions or [])[:10])
+            inv.cached_system_prompt = system
+            await session.commit()
     transcript = (body.transcript_so_far or "").strip()
     candidate_message = (body.candidate_message or "").strip()
     if not candidate_message:
@@ -715,8 +818,19 @@ async def interview_chat(body: InterviewChatRequest):
             "\n\nRespond as the interviewer with your next question or follow-up "
             "(only the interviewer line, no prefix)."
         )
+    # The opener depends only on the system prompt, so it is shared by sessions with the same JD, profile and
+    # questions; replies to real candidate text are never cached
+    opener_key = None
+    if not candidate_message:
+        opener_key = cache_key(
+            INTERVIEW_OPENER_PROMPT_VERSION, LLM_MODEL_ID, system.encode("utf-8"), user_content.encode("utf-8")
+        )
+        async with get_session() as session:
+            cached = await get_cached_response(session, opener_key)
+        if cached is not None:
+            return {"reply": cached["reply"]}
     try:
-        response = get_llm().invoke([
+        response = await get_llm().ainvoke([
             SystemMessage(content=system),
             HumanMessage(content=user_content),
         ])
@@ -724,6 +838,13 @@ async def interview_chat(body: InterviewChatRequest):
     except Exception as e:
         logger.exception("Interview chat LLM failed: %s", e)
         raise HTTPException(status_code=500, detail="Failed to generate interviewer response.")
+    if opener_key and agent_reply:
+        await store_cached_responses(
+            INTERVIEW_OPENER_PROMPT_VERSION,
+            LLM_MODEL_ID,
+            {opener_key: {"reply": agent_reply}},
+            ttl=INTERVIEW_OPENER_CACHE_TTL,
+        )
     return {"reply": agent_reply}
 
 
@@ -736,30 +857,21 @@ class InterviewCompleteRequest(BaseModel):
 async def interview_complete(body: InterviewCompleteRequest):
     """Store transcript, score via interview mastermind, and mark interview completed. No auth required."""
     async with get_session() as session:
-        inv = (
+        # One round-trip for session, candidate link, job and profile (same shape as interview_join)
+        row = (
             await session.execute(
-                select(InterviewSession).where(
-                    InterviewSession.interview_link_token == body.token.strip()
-                )
+                select(InterviewSession, JobCandidate, Job, CandidateProfile)
+                .outerjoin(JobCandidate, JobCandidate.id == InterviewSession.job_candidate_id)
+                .outerjoin(Job, Job.id == JobCandidate.job_id)
+                .outerjoin(CandidateProfile, CandidateProfile.id == JobCandidate.candidate_profile_id)
+                .where(InterviewSession.interview_link_token == body.token.strip())
             )
-        ).scalar_one_or_none()
-        if not inv:
+        ).one_or_none()
+        if not row:
             raise HTTPException(status_code=404, detail="Invalid or expired interview link.")
-        jc = (
-            await session.execute(
-                select(JobCandidate).where(JobCandidate.id == inv.job_candidate_id)
-            )
-        ).scalar_one_or_none()
+        inv, jc, job, cp = row
         if not jc or jc.interview_completed_at:
             raise HTTPException(status_code=400, detail="Interview already completed.")
-        job = (
-            await session.execute(select(Job).where(Job.id == jc.job_id))
-        ).scalar_one_or_none()
-        cp = (
-            await session.execute(
-                select(CandidateProfile).where(CandidateProfile.id == jc.candidate_profile_id)
-            )
-        ).scalar_one_or_none()
         if not job or not cp:
             raise HTTPException(status_code=404, detail="Job or candidate not found.")
         inv.transcript = (body.transcript or "").strip() or None
@@ -778,10 +890,19 @@ async def interview_complete(body: InterviewCompleteRequest):
             logger.exception("Interview scoring failed: %s", e)
         jc.interview_completed_at = datetime.now(timezone.utc)
         await session.commit()
-        await session.refresh(inv)
     return {"message": "Interview completed.", "score": inv.score}
 
 
+_RECORDING_COPY_CHUNK = 1 << 20  # 1 MiB
+
+
+def _copy_upload_to_path(src, path: Path) -> None:
+    """Copy an upload's spooled file to disk in fixed-size chunks (runs in a worker thread)."""
+    src.seek(0)
+    with path.open("wb") as out:
+        shutil.copyfileobj(src, out, _RECORDING_COPY_CHUNK)
+
+
 @app.post("/interview/upload-recording")
 async def interview_upload_recording(
     token: str = Form(...),
@@ -789,31 +910,74 @@ async def interview_upload_recording(
 ):
     """Upload interview recording (video/audio). No auth required. Token in form."""
     async with get_session() as session:
-        inv = (
+        row = (
             await session.execute(
-                select(InterviewSession).where(
+                select(InterviewSession.id, InterviewSession.job_candidate_id).where(
                     InterviewSession.interview_link_token == token.strip()
                 )
             )
-        ).scalar_one_or_none()
-        if not inv:
-            raise HTTPException(status_code=404, detail="Invalid or expired interview link.")
-        ext = Path(file.filename or "recording").suffix or ".webm"
-        safe_name = f"{inv.job_candidate_id}_{inv.id}_{secrets.token_hex(4)}{ext}"
-        path = RECORDINGS_DIR / safe_name
-        content = await file.read()
-        path.write_bytes(content)
-        recording_url = f"/recordings/{safe_name}"
-        inv.recording_url = recording_url
+        ).one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Invalid or expired interview link.")
+    inv_id, job_candidate_id = row
+    ext = Path(file.filename or "recording").suffix or ".webm"
+    safe_name = f"{job_candidate_id}_{inv_id}_{secrets.token_hex(4)}{ext}"
+    path = RECORDINGS_DIR / safe_name
+    # No session is held while the recording is copied to disk
+    try:
+        await asyncio.to_thread(_copy_upload_to_path, file.file, path)
+    finally:
+        await file.close()
+    recording_url = f"/recordings/{safe_name}"
+    async with get_session() as session:
+        await session.execute(
+            update(InterviewSession).where(InterviewSession.id == inv_id).values(recording_url=recording_url)
+        )
         await session.commit()
     return {"recording_url": recording_url}
 
 
 # ---------- Employer / Job portal ----------
+_INTERVIEW_SYSTEM_PROMPT = (
+    "You are the interviewer in a live 10-minute video interview. Use the job description and candidate profile to ask "
+    "relevant questions. Cover the suggested questions naturally; follow up on the candidate's answers. "
+    "Keep each response to 1-3 sentences. Be professional and concise.\n\n"
+    "Job description:\n{jd}\n\nCandidate profile:\n{profile}\n\n"
+    "Suggested questions to cover:\n{questions}"
+)
+
+
+def _interview_system_prompt(job: Job, cp: CandidateProfile, questions: list[str]) -> str:
+    """Interviewer system prompt for interview_chat: JD, candidate profile and suggested questions."""
+    questions_text = "\n".join(f"{i+1}. {q}" for i, q in enumerate(questions)) if questions else "Ask role-specific and behavioral questions."
+    return _INTERVIEW_SYSTEM_PROMPT.format(
+        jd=_job_content_for_agent(job)[:3000],
+        profile=orjson.dumps(_candidate_profile_for_agent(cp)).decode("utf-8")[:2000],
+        questions=questions_text,
+    )
+
+
+# Job -> (description_schema it was built from, its JSON); entries go away with their Job instance
+_job_schema_json_memo: weakref.WeakKeyDictionary[Job, tuple[Any, str]] = weakref.WeakKeyDictionary()
+
+
+def _job_schema_json(job: Job) -> str:
+    """Serialize job.description_schema once per instance, keeping its key order.
+
+    The memo is tied to the schema object, so assigning a new description_schema invalidates it.
+    """
+    schema = job.description_schema
+    memo = _job_schema_json_memo.get(job)
+    if memo is None or memo[0] is not schema:
+        memo = (schema, orjson.dumps(schema).decode("utf-8"))
+        _job_schema_json_memo[job] = memo
+    return memo[1]
+
+
 def _job_content_for_agent(job: Job) -> str:
     """Return JD as schema JSON string when available, else description_md."""
     if job.description_schema:
-        return json.dumps(job.description_schema)
+        return _job_schema_json(job)
     return job.description_md or ""
 
 
@@ -824,25 +988,35 @@ def _job_schema_for_best_match(job: Job) -> str:
             status_code=400,
             detail="Best match requires job with structured description (schema). Save or generate the JD in structured form first.",
         )
-    return json.dumps(job.description_schema)
+    return _job_schema_json(job)
 
 
 def _candidate_profile_for_agent(cp: CandidateProfile) -> dict[str, Any]:
-    """Return full candidate profile as a JSON-serializable dict for the interview agent."""
-    return {
-        "full_name": cp.full_name,
-        "email": cp.email,
-        "phone": cp.phone,
-        "address": cp.address,
-        "summary": cp.summary,
-        "education": cp.education or [],
-        "work_experience": cp.work_experience or [],
-        "skills": cp.skills if isinstance(cp.skills, list) else (cp.skills or []),
-        "languages": cp.languages or [],
-        "certifications": cp.certifications if isinstance(cp.certifications, list) else (cp.certifications or []),
-        "interests": cp.interests or [],
-        "projects": cp.projects or [],
-    }
+    """Return full candidate profile as a JSON-serializable dict for the interview agent (same shape as GET /candidate/profile)."""
+    return {k: (getattr(cp, k) or []) if k in _LIST_KEYS else getattr(cp, k) for k in _PROFILE_KEYS}
+
+
+async def _prepare_questions(session, job: Job, cp: CandidateProfile) -> list[str]:
+    """Interview questions for a (job, candidate) pair via the interview mastermind, cached in llm_cache by their content.
+
+    session is only read from. Non-empty results are stored best-effort in a session of their own, so a cache write
+    (or two requests caching the same pair at once) never rolls back or fails the caller's transaction.
+    """
+    job_content = _job_content_for_agent(job)
+    profile = _candidate_profile_for_agent(cp)
+    key = cache_key(
+        INTERVIEW_QUESTIONS_PROMPT_VERSION,
+        LLM_MODEL_ID,
+        job_content.encode("utf-8"),
+        orjson.dumps(profile, option=orjson.OPT_SORT_KEYS),
+    )
+    cached = await get_cached_response(session, key)
+    if cached is not None:
+        return cached["questions"]
+    questions = _parse_questions_from_agent(await agent_client.interview_prepare_questions(job_content, profile))
+    if questions:
+        await store_cached_responses(INTERVIEW_QUESTIONS_PROMPT_VERSION, LLM_MODEL_ID, {key: {"questions": questions}})
+    return questions
 
 
 class JobCreate(BaseModel):
@@ -879,14 +1053,29 @@ async def employer_generate_jd(
     prompt = (body.prompt or "").strip()
     if not prompt:
         raise HTTPException(status_code=400, detail="Prompt is required.")
-    try:
-        result = invoke_structured_with_retry(
+
+    async def generate() -> dict[str, Any]:
+        output = await ainvoke_structured_with_retry(
             [
                 SystemMessage(content=JD_GEN_SYSTEM),
                 HumanMessage(content=prompt),
             ],
             GenerateJDOutput,
         )
+        return output.model_dump()
+
+    try:
+        # Repeated prompts are served from llm_cache (bump JD_GENERATE_PROMPT_VERSION when GenerateJDOutput changes)
+        inputs = (JD_GEN_SYSTEM.encode("utf-8"), prompt.encode("utf-8"))
+        try:
+            result = GenerateJDOutput.model_validate(await cached_call(JD_GENERATE_PROMPT_VERSION, inputs, generate))
+        except ValidationError:
+            # A row stored under an older GenerateJDOutput shape: drop it and generate afresh
+            logger.warning("Discarding cached JD that no longer validates")
+            async with get_session() as session:
+                await delete_cached_response(session, cache_key(JD_GENERATE_PROMPT_VERSION, LLM_MODEL_ID, *inputs))
+                await session.commit()
+            result = GenerateJDOutput.model_validate(await cached_call(JD_GENERATE_PROMPT_VERSION, inputs, generate))
         title = (result.title or "").strip() or "Untitled role"
         description_md = (result.description_md or "").strip() or job_description_to_markdown(
             {"job_description": result.job_description}
@@ -913,7 +1102,7 @@ async def employer_create_job(
         description_md = body.description_md or ""
     async with get_session() as session:
         job = Job(
-            employer_id=int(user["user_id"]),
+            employer_id=user["user_id"],
             title=body.title,
             description_md=description_md,
             description_schema=description_schema,
@@ -921,7 +1110,6 @@ async def employer_create_job(
         )
         session.add(job)
         await session.commit()
-        await session.refresh(job)
         return {"id": job.id, "title": job.title, "status": job.status}
 
 
@@ -930,8 +1118,13 @@ async def employer_list_jobs(
     user: Annotated[dict, Depends(require_role("employer"))],
 ):
     async with get_session() as session:
-        rows = (await session.execute(select(Job).where(Job.employer_id == int(user["user_id"])))).scalars().all()
-        return [{"id": r.id, "title": r.title, "status": r.status, "created_at": r.created_at.isoformat()} for r in rows]
+        # Column rows, no ORM objects; the response encoder turns created_at into the same isoformat() string
+        rows = (
+            await session.execute(
+                select(Job.id, Job.title, Job.status, Job.created_at).where(Job.employer_id == user["user_id"])
+            )
+        ).mappings().all()
+    return [dict(r) for r in rows]
 
 
 @app.get("/employer/jobs/{job_id}")
@@ -940,16 +1133,15 @@ async def employer_get_job(
     user: Annotated[dict, Depends(require_role("employer"))],
 ):
     async with get_session() as session:
-        row = (await session.execute(select(Job).where(Job.id == job_id, Job.employer_id == int(user["user_id"])))).scalar_one_or_none()
-        if not row:
-            raise HTTPException(status_code=404, detail="Job not found")
-        return {
-            "id": row.id,
-            "title": row.title,
-            "description_md": row.description_md,
-            "description_schema": row.description_schema,
-            "status": row.status,
-        }
+        row = (
+            await session.execute(
+                select(Job.id, Job.title, Job.description_md, Job.description_schema, Job.status)
+                .where(Job.id == job_id, Job.employer_id == user["user_id"])
+            )
+        ).mappings().one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return dict(row)
 
 
 class JobUpdate(BaseModel):
@@ -966,7 +1158,7 @@ async def employer_update_job(
 ):
     """Update job title and/or description. Only allowed for drafts."""
     async with get_session() as session:
-        row = (await session.execute(select(Job).where(Job.id == job_id, Job.employer_id == int(user["user_id"])))).scalar_one_or_none()
+        row = (await session.execute(select(Job).where(Job.id == job_id, Job.employer_id == user["user_id"]))).scalar_one_or_none()
         if not row:
             raise HTTPException(status_code=404, detail="Job not found")
         if row.status != "draft":
@@ -982,7 +1174,6 @@ async def employer_update_job(
         elif body.description_md is not None:
             row.description_md = body.description_md
         await session.commit()
-        await session.refresh(row)
         return {
             "id": row.id,
             "title": row.title,
@@ -999,113 +1190,181 @@ async def employer_publish_job(
 ):
     """Publish job: ensure description_schema exists (via job description mastermind if needed), then get top 10 candidates from resume mastermind, send interview invites via interview mastermind."""
     logger.info("employer_publish_job started job_id=%s employer_id=%s", job_id, user.get("user_id"))
+    # DB work and agent/LLM calls never overlap: no session is open while awaiting the JD schema, best_match or emails.
     async with get_session() as session:
-        job = (await session.execute(select(Job).where(Job.id == job_id, Job.employer_id == int(user["user_id"])))).scalar_one_or_none()
+        job = (await session.execute(select(Job).where(Job.id == job_id, Job.employer_id == user["user_id"]))).scalar_one_or_none()
         if not job:
             logger.warning("employer_publish_job job not found job_id=%s employer_id=%s", job_id, user.get("user_id"))
             raise HTTPException(status_code=404, detail="Job not found")
         logger.info("employer_publish_job job found id=%s title=%s status=%s", job.id, job.title, job.status)
-        # Generate description_schema via job description mastermind if job has only description_md
-        if not job.description_schema and (job.description_md or "").strip():
-            logger.info("employer_publish_job generating description_schema via job description mastermind job_id=%s", job_id)
-            result = await agent_client.job_description_generate_schema(job.description_md)
-            logger.info("employer_publish_job job_description_generate_schema result keys=%s", list(result.keys()) if isinstance(result, dict) else type(result).__name__)
-            if "error" in result:
-                logger.warning("employer_publish_job job_description_generate_schema error job_id=%s result=%s", job_id, result)
-                schema = None
-            else:
-                # Store full root { "job_description": { ... } } per schema
-                schema = result if result.get("job_description") else None
-                if schema:
-                    job.description_schema = schema
-                    job.description_md = job_description_to_markdown(schema)
-                    await session.flush()
-                    logger.info("employer_publish_job description_schema stored and description_md updated job_id=%s", job_id)
-                else:
-                    logger.info("employer_publish_job no job_description in result, schema not stored job_id=%s", job_id)
+        # Fetch all candidate profiles for best_match as plain rows (no ORM identity map / change tracking);
+        # summary is only for the opportunity emails below
+        profiles = (
+            await session.execute(
+                select(
+                    CandidateProfile.id,
+                    CandidateProfile.full_name,
+                    CandidateProfile.email,
+                    CandidateProfile.skills,
+                    CandidateProfile.work_experience,
+                    CandidateProfile.education,
+                    CandidateProfile.summary,
+                )
+            )
+        ).all()
+    logger.info("employer_publish_job fetched %s candidate profiles for best_match job_id=%s", len(profiles), job_id)
+    # job is detached from here on; schema changes are written back with an UPDATE below
+    job_values: dict[str, Any] = {"status": "published"}
+    # Generate description_schema via job description mastermind if job has only description_md
+    if not job.description_schema and (job.description_md or "").strip():
+        logger.info("employer_publish_job generating description_schema via job description mastermind job_id=%s", job_id)
+        result = await agent_client.job_description_generate_schema(job.description_md)
+        logger.info("employer_publish_job job_description_generate_schema result keys=%s", list(result.keys()) if isinstance(result, dict) else type(result).__name__)
+        if not result or "error" in result:
+            logger.warning("employer_publish_job job_description_generate_schema error job_id=%s result=%s", job_id, result)
+        elif result.get("job_description"):
+            # Store full root { "job_description": { ... } } per schema
+            job.description_schema = job_values["description_schema"] = result
+            job.description_md = job_values["description_md"] = job_description_to_markdown(result)
+            logger.info("employer_publish_job description_schema generated job_id=%s", job_id)
         else:
-            logger.info("employer_publish_job skipping schema generation job_id=%s has_schema=%s has_md=%s", job_id, bool(job.description_schema), bool((job.description_md or "").strip()))
-        # Fetch all candidate profiles for best_match
-        profiles = (await session.execute(select(CandidateProfile))).scalars().all()
-        logger.info("employer_publish_job fetched %s candidate profiles for best_match job_id=%s", len(profiles), job_id)
-        candidates_payload = [
-            {
-                "id": p.id,
-                "full_name": p.full_name,
-                "email": p.email,
-                "skills": p.skills or [],
-                "work_experience": p.work_experience or [],
-                "education": p.education or [],
-            }
-            for p in profiles
-        ]
-        job_schema = _job_schema_for_best_match(job)
-        logger.info("employer_publish_job calling resume_best_match job_id=%s candidates_count=%s", job_id, len(candidates_payload))
-        top = await agent_client.resume_best_match(job_schema, candidates_payload)
-        top_5 = top.get("top_5") or top.get("top_10") or []
-        if len(top_5) > 5:
-            top_5 = top_5[:5]
-        logger.info("employer_publish_job resume_best_match returned top_5 count=%s job_id=%s raw_keys=%s", len(top_5), job_id, list(top.keys()))
-        # Create JobCandidate and InterviewSession placeholders; interview mastermind will send emails
-        created = 0
-        skipped = 0
+            logger.info("employer_publish_job no job_description in result, schema not stored job_id=%s", job_id)
+    else:
+        logger.info("employer_publish_job skipping schema generation job_id=%s has_schema=%s has_md=%s", job_id, bool(job.description_schema), bool((job.description_md or "").strip()))
+    candidates_payload = [
+        {
+            "id": p.id,
+            "full_name": p.full_name,
+            "email": p.email,
+            "skills": p.skills or [],
+            "work_experience": p.work_experience or [],
+            "education": p.education or [],
+        }
+        for p in profiles
+    ]
+    job_schema = _job_schema_for_best_match(job)
+    logger.info("employer_publish_job calling resume_best_match job_id=%s candidates_count=%s", job_id, len(candidates_payload))
+    top = await agent_client.resume_best_match(job_schema, candidates_payload)
+    top_5 = top.get("top_5") or top.get("top_10") or []
+    if len(top_5) > 5:
+        top_5 = top_5[:5]
+    logger.info("employer_publish_job resume_best_match returned top_5 count=%s job_id=%s raw_keys=%s", len(top_5), job_id, list(top.keys()))
+    # Create JobCandidate and InterviewSession placeholders; interview mastermind will send emails
+    created = 0
+    skipped = 0
+    # best_match ranks the profiles loaded above, so resolve its ids from them instead of one SELECT each
+    profiles_by_id = {p.id: p for p in profiles}
+    async with get_session() as session:
+        # Read links in the write transaction so a concurrent publish cannot double-link a candidate
+        already_linked = set(
+            (await session.execute(select(JobCandidate.candidate_profile_id).where(JobCandidate.job_id == job_id))).scalars().all()
+        )
+        jc_values: list[dict[str, Any]] = []
         for i, entry in enumerate(top_5):
             profile_id = entry.get("profile_id") or entry.get("id")
             rank = entry.get("rank", i + 1)
-            cand = (await session.execute(select(CandidateProfile).where(CandidateProfile.id == profile_id))).scalar_one_or_none()
+            try:
+                cand = profiles_by_id.get(int(profile_id))
+            except (TypeError, ValueError):
+                cand = None
             if not cand:
                 logger.warning("employer_publish_job candidate not found profile_id=%s rank=%s job_id=%s", profile_id, rank, job_id)
                 skipped += 1
                 continue
-            jc = JobCandidate(
-                job_id=job.id,
-                candidate_profile_id=cand.id,
-                rank=rank,
-                invited_at=job.created_at,
+            if cand.id in already_linked:
+                logger.info("employer_publish_job candidate already linked profile_id=%s job_id=%s", cand.id, job_id)
+                skipped += 1
+                continue
+            already_linked.add(cand.id)
+            jc_values.append({
+                "job_id": job_id,
+                "candidate_profile_id": cand.id,
+                "rank": rank,
+                "invited_at": job.created_at,
+            })
+        if jc_values:
+            # Two INSERTs total: JobCandidates with RETURNING ids (in parameter order), then their InterviewSessions
+            jc_ids = (
+                await session.execute(
+                    insert(JobCandidate).returning(JobCandidate.id, sort_by_parameter_order=True),
+                    jc_values,
+                )
+            ).scalars().all()
+            await session.execute(
+                insert(InterviewSession),
+                [
+                    {"job_candidate_id": jc_id, "interview_link_token": token}
+                    for jc_id, token in zip(jc_ids, _interview_link_tokens(len(jc_ids)))
+                ],
             )
-            session.add(jc)
-            await session.flush()
-            token = secrets.token_urlsafe(32)
-            inv = InterviewSession(job_candidate_id=jc.id, interview_link_token=token)
-            session.add(inv)
-            created += 1
-            logger.info("employer_publish_job created JobCandidate jc_id=%s candidate_id=%s rank=%s job_id=%s", jc.id, cand.id, rank, job_id)
+            created = len(jc_ids)
+            for jc_id, values in zip(jc_ids, jc_values):
+                logger.info("employer_publish_job created JobCandidate jc_id=%s candidate_id=%s rank=%s job_id=%s", jc_id, values["candidate_profile_id"], values["rank"], job_id)
         logger.info("employer_publish_job JobCandidate/InterviewSession created=%s skipped=%s job_id=%s", created, skipped, job_id)
-        job.status = "published"
+        await session.execute(update(Job).where(Job.id == job_id).values(**job_values))
         await session.commit()
         logger.info("employer_publish_job committed job status=published job_id=%s", job_id)
 
-        # Send "job opportunity" emails (job + profile); candidates see open opportunities in UI and swipe right to get interview link
-        async with get_session() as session2:
-            job_row = (await session2.execute(select(Job).where(Job.id == job_id))).scalar_one_or_none()
-            jd_md = (job_row.description_md or "") if job_row else ""
-            jc_list = (await session2.execute(select(JobCandidate).where(JobCandidate.job_id == job_id))).scalars().all()
-            logger.info("employer_publish_job email phase job_id=%s jc_count=%s jd_md_len=%s", job_id, len(jc_list), len(jd_md))
-            infos = []
-            for jc in jc_list:
-                cp = (await session2.execute(select(CandidateProfile).where(CandidateProfile.id == jc.candidate_profile_id))).scalar_one_or_none()
-                if not cp or not cp.email:
-                    if not cp:
-                        logger.warning("employer_publish_job email skip: candidate profile not found jc_id=%s", jc.id)
-                    elif not cp.email:
-                        logger.warning("employer_publish_job email skip: candidate has no email profile_id=%s", cp.id)
-                    continue
-                infos.append({
-                    "email": cp.email,
-                    "full_name": cp.full_name or "Candidate",
-                    "profile_summary": cp.summary or "",
-                })
-            logger.info("employer_publish_job sending interview_send_potential_match job_id=%s job_title=%s candidate_infos_count=%s", job_id, job.title, len(infos))
-            await agent_client.interview_send_potential_match(
-                job_title=job.title,
-                job_description_md=jd_md,
-                candidate_infos=infos,
-            )
-            logger.info("employer_publish_job interview_send_potential_match completed job_id=%s", job_id)
+    # Send "job opportunity" emails (job + profile) in the background; candidates see open opportunities in UI and swipe right to get interview link.
+    # already_linked holds every candidate on the job and all profiles are loaded, so the recipients come from memory.
+    jd_md = job.description_md or ""
+    infos = _potential_match_infos_from_rows(
+        ((p.id, p.email, p.full_name, p.summary) for p in map(profiles_by_id.get, already_linked) if p),
+        job_id,
+    )
+    logger.info("employer_publish_job email phase job_id=%s jd_md_len=%s", job_id, len(jd_md))
+    logger.info("employer_publish_job sending interview_send_potential_match job_id=%s job_title=%s candidate_infos_count=%s", job_id, job.title, len(infos))
+    _spawn_background(
+        agent_client.interview_send_potential_match(
+            job_title=job.title,
+            job_description_md=jd_md,
+            candidate_infos=infos,
+        ),
+        name=f"potential-match-emails-{job_id}",
+    )
     logger.info("employer_publish_job finished job_id=%s", job_id)
     return {"message": "Job published. Top candidates notified; they can view opportunities in the app and swipe right to get their interview link."}
 
 
+_LINK_TOKEN_BYTES = 32
+
+
+def _interview_link_tokens(n: int) -> list[str]:
+    """n tokens equivalent to secrets.token_urlsafe(32), drawn from a single os.urandom read."""
+    raw = os.urandom(_LINK_TOKEN_BYTES * n)
+    return [
+        base64.urlsafe_b64encode(raw[i:i + _LINK_TOKEN_BYTES]).rstrip(b"=").decode("ascii")
+        for i in range(0, len(raw), _LINK_TOKEN_BYTES)
+    ]
+
+
+async def _potential_match_infos(session, job_id: int) -> list[dict[str, Any]]:
+    """Email recipients (email, full_name, profile_summary) for every candidate linked to a job, in one joined query."""
+    rows = (
+        await session.execute(
+            select(CandidateProfile.id, CandidateProfile.email, CandidateProfile.full_name, CandidateProfile.summary)
+            .join(JobCandidate, JobCandidate.candidate_profile_id == CandidateProfile.id)
+            .where(JobCandidate.job_id == job_id)
+        )
+    ).all()
+    return _potential_match_infos_from_rows(rows, job_id)
+
+
+def _potential_match_infos_from_rows(rows, job_id: int) -> list[dict[str, Any]]:
+    """Build email recipients from (profile_id, email, full_name, summary) rows, skipping profiles without email."""
+    infos = []
+    for profile_id, email, full_name, summary in rows:
+        if not email:
+            logger.warning("Potential match email skip: candidate has no email profile_id=%s job_id=%s", profile_id, job_id)
+            continue
+        infos.append({
+            "email": email,
+            "full_name": full_name or "Candidate",
+            "profile_summary": summary or "",
+        })
+    return infos
+
+
 @app.post("/employer/jobs/{job_id}/reinvite")
 async def employer_reinvite_candidates(
     job_id: int,
@@ -1113,22 +1372,12 @@ async def employer_reinvite_candidates(
 ):
     """Re-send 'potential match' emails to all candidates already invited for this published job."""
     async with get_session() as session:
-        job = (await session.execute(select(Job).where(Job.id == job_id, Job.employer_id == int(user["user_id"])))).scalar_one_or_none()
+        job = (await session.execute(select(Job).where(Job.id == job_id, Job.employer_id == user["user_id"]))).scalar_one_or_none()
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         if job.status != "published":
             raise HTTPException(status_code=400, detail="Only published jobs can reinvite candidates.")
-        jc_list = (await session.execute(select(JobCandidate).where(JobCandidate.job_id == job_id))).scalars().all()
-        infos = []
-        for jc in jc_list:
-            cp = (await session.execute(select(CandidateProfile).where(CandidateProfile.id == jc.candidate_profile_id))).scalar_one_or_none()
-            if not cp or not cp.email:
-                continue
-            infos.append({
-                "email": cp.email,
-                "full_name": cp.full_name or "Candidate",
-                "profile_summary": cp.summary or "",
-            })
+        infos = await _potential_match_infos(session, job_id)
         if not infos:
             return {"message": "No candidates with email to reinvite."}
         await agent_client.interview_send_potential_match(
@@ -1149,7 +1398,7 @@ async def employer_finalize_job(
     async with get_session() as session:
         job = (
             await session.execute(
-                select(Job).where(Job.id == job_id, Job.employer_id == int(user["user_id"]))
+                select(Job).where(Job.id == job_id, Job.employer_id == user["user_id"])
             )
         ).scalar_one_or_none()
         if not job:
@@ -1165,6 +1414,18 @@ async def employer_finalize_job(
         ).all()
     candidates_payload = []
     scored = [(jc, inv, cp) for jc, inv, cp in jc_list if jc.interview_completed_at and (inv and inv.transcript)]
+    # Score completed interviews whose scoring failed at completion time, concurrently
+    unscored = [(jc, inv, cp) for jc, inv, cp in scored if jc.score is None]
+    new_scores: dict[int, float] = {}
+    if unscored:
+        job_content = _job_content_for_agent(job)
+        score_results = await agent_client.interview_score_batch([
+            {"job_description": job_content, "resume_summary": cp.summary or "", "transcript": inv.transcript}
+            for jc, inv, cp in unscored
+        ])
+        for (jc, inv, cp), score_result in zip(unscored, score_results):
+            if score_result.get("score") is not None:
+                jc.score = new_scores[jc.id] = float(score_result["score"])
     for jc, inv, cp in scored:
         candidates_payload.append({
             "job_candidate_id": jc.id,
@@ -1176,22 +1437,33 @@ async def employer_finalize_job(
             "score": jc.score,
             "selected_top_3": False,
         })
-    sorted_by_score = sorted(candidates_payload, key=lambda c: (c["score"] or 0), reverse=True)
-    top_3 = sorted_by_score[:3]
-    top_3_ids = [c["profile_id"] for c in top_3]
+    # Same result as sorted(..., reverse=True)[:3], ties included, without sorting the whole list
+    top_3 = heapq.nlargest(3, candidates_payload, key=lambda c: c["score"] or 0)
+    top_3_ids = [c["profile_id"] for c in top_3]  # list: sent in the JD mastermind payload
+    top_3_set = frozenset(top_3_ids)
     for c in candidates_payload:
-        c["selected_top_3"] = c["profile_id"] in top_3_ids
+        c["selected_top_3"] = c["profile_id"] in top_3_set
     if not candidates_payload:
         raise HTTPException(
             status_code=400,
             detail="No completed interviews to finalize. Candidates must complete their video interviews first.",
         )
     async with get_session() as session:
-        jc_rows = (
-            await session.execute(select(JobCandidate).where(JobCandidate.job_id == job_id))
-        ).scalars().all()
-        for jc in jc_rows:
-            jc.selected_top_3 = jc.candidate_profile_id in top_3_ids
+        # Set-based writes: no need to reload the job's JobCandidate rows
+        await session.execute(
+            update(JobCandidate)
+            .where(JobCandidate.job_id == job_id)
+            .values(selected_top_3=JobCandidate.candidate_profile_id.in_(top_3_ids))
+        )
+        if new_scores:
+            await session.execute(
+                update(JobCandidate),
+                [{"id": jc_id, "score": score} for jc_id, score in new_scores.items()],
+            )
+        # The job closes whether or not the JD mastermind call below succeeds, so it commits with the selection
+        await session.execute(
+            update(Job).where(Job.id == job_id, Job.employer_id == user["user_id"]).values(status="closed")
+        )
         await session.commit()
     try:
         await agent_client.job_description_store_interview_results(
@@ -1202,38 +1474,46 @@ async def employer_finalize_job(
         )
     except Exception as e:
         logger.exception("JD mastermind store_interview_results failed: %s", e)
-    async with get_session() as session:
-        job = (
-            await session.execute(
-                select(Job).where(Job.id == job_id, Job.employer_id == int(user["user_id"]))
-            )
-        ).scalar_one_or_none()
-        if job:
-            job.status = "closed"
-            await session.commit()
     return {
         "message": "Job finalized. Top 3 candidates highlighted; results sent to job description mastermind.",
         "top_3": [c["full_name"] for c in top_3],
     }
 
 
-def _extract_text_pdf(content: bytes) -> str:
-    reader = PdfReader(io.BytesIO(content))
-    return "\n".join(page.extract_text() or "" for page in reader.pages)
+async def _spool_resume_upload(file: UploadFile) -> tempfile.SpooledTemporaryFile:
+    """Copy an upload into a spooled temp file chunk by chunk, rejecting it as soon as it exceeds the size limit.
+
+    Returns the spool positioned at its end (tell() is the size); the caller closes it.
+    """
+    limit = MAX_RESUME_SIZE_MB * 1024 * 1024
+    spool = tempfile.SpooledTemporaryFile(max_size=_UPLOAD_SPOOL_MAX_BYTES)
+    size = 0
+    while chunk := await file.read(_UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if size > limit:
+            spool.close()
+            logger.warning("Resume upload rejected: file too large (over %s MB) filename=%s", MAX_RESUME_SIZE_MB, file.filename)
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Max size: {MAX_RESUME_SIZE_MB} MB",
+            )
+        spool.write(chunk)
+    return spool
 
 
-def _extract_text_docx(content: bytes) -> str:
-    if DocxDocument is None:
+async def _extract_resume_text(request: Request, suffix: str, content: bytes) -> str:
+    """Extract resume text in the process pool; raise 501 up front when DOCX support is missing."""
+    if suffix == ".docx" and not DOCX_AVAILABLE:
         raise HTTPException(
             status_code=501,
             detail="DOCX support requires python-docx. Install with: pip install python-docx",
         )
-    doc = DocxDocument(io.BytesIO(content))
-    return "\n".join(p.text for p in doc.paragraphs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(request.app.state.extract_pool, RESUME_TEXT_EXTRACTORS[suffix], content)
 
 
 @app.post("/agent/extract-resume")
-async def extract_resume(file: UploadFile = File(...)):
+async def extract_resume(request: Request, file: UploadFile = File(...)):
     """
     Upload a resume file (PDF or DOCX); returns extracted plain text.
     """
@@ -1243,23 +1523,15 @@ async def extract_resume(file: UploadFile = File(...)):
             status_code=400,
             detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_RESUME_EXTENSIONS)}",
         )
-    content = await file.read()
-    if len(content) > MAX_RESUME_SIZE_MB * 1024 * 1024:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Max size: {MAX_RESUME_SIZE_MB} MB",
-        )
+    with await _spool_resume_upload(file) as spool:
+        spool.seek(0)
+        content = spool.read()
     try:
-        if suffix == ".pdf":
-            text = _extract_text_pdf(content)
-        else:
-            text = _extract_text_docx(content)
+        text = await _extract_resume_text(request, suffix, content)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Resume extraction failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to extract text: {e}") from e
     return {"text": text, "filename": file.filename}
 
-
-# Run the FastAPI server using uvicorn (from repo root: python exchange/main.py)
-if __name__ == "__main__":
-    uvicorn.run("exchange.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
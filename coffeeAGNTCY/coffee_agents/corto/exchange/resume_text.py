@@ -0,0 +1,76 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+# Kept free of app imports: these functions run in ProcessPoolExecutor workers, which import this module.
+# Parser libraries are imported on first use, so the API process (which only dispatches) never loads them.
+
+import importlib.util
+import io
+import shutil
+import subprocess
+from typing import Callable
+
+DOCX_AVAILABLE = importlib.util.find_spec("docx") is not None
+
+# Native PDF text extractors are several times faster than pypdf. PyMuPDF is used when installed
+# (not a declared dependency: it is AGPL-licensed), then poppler's pdftotext; pypdf is the fallback.
+PYMUPDF_AVAILABLE = importlib.util.find_spec("pymupdf") is not None
+
+PDFTOTEXT = shutil.which("pdftotext")
+_PDFTOTEXT_TIMEOUT_S = 60
+
+
+def _extract_text_pdf_pymupdf(content: bytes) -> str:
+    import pymupdf
+
+    with pymupdf.open(stream=content, filetype="pdf") as doc:
+        return "\n".join(page.get_text("text") for page in doc)
+
+
+def _extract_text_pdftotext(content: bytes) -> str:
+    # "-" "-": read the PDF from stdin, write text to stdout
+    result = subprocess.run(
+        [PDFTOTEXT, "-layout", "-enc", "UTF-8", "-", "-"],
+        input=content,
+        capture_output=True,
+        timeout=_PDFTOTEXT_TIMEOUT_S,
+        check=True,
+    )
+    return result.stdout.decode("utf-8", errors="replace")
+
+
+def _extract_text_pypdf(content: bytes) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(content))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def extract_text_pdf(content: bytes) -> str:
+    if PYMUPDF_AVAILABLE:
+        try:
+            return _extract_text_pdf_pymupdf(content)
+        except RuntimeError:
+            pass  # pymupdf.FileDataError (a RuntimeError) on damaged files; the other parsers may still read them
+    if PDFTOTEXT:
+        try:
+            return _extract_text_pdftotext(content)
+        except (subprocess.SubprocessError, OSError):
+            pass  # malformed for poppler or binary gone; let pypdf try
+    return _extract_text_pypdf(content)
+
+
+def extract_text_docx(content: bytes) -> str:
+    if not DOCX_AVAILABLE:
+        raise RuntimeError("DOCX support requires python-docx")
+    from docx import Document as DocxDocument
+
+    doc = DocxDocument(io.BytesIO(content))
+    return "\n".join(p.text for p in doc.paragraphs)
+
+
+# File suffix -> extractor; the keys are the accepted resume types
+EXTRACTORS: dict[str, Callable[[bytes], str]] = {
+    ".pdf": extract_text_pdf,
+    ".docx": extract_text_docx,
+}
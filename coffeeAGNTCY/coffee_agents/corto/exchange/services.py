@@ -1,78 +1,85 @@
 # Copyright AGNTCY Contributors (https://github.com/agntcy)
 # SPDX-License-Identifier: Apache-2.0
 
-import json
+import asyncio
 import logging
 import os
 from typing import Any
-from uuid import uuid4
 
+import orjson
 from agntcy_app_sdk.factory import AgntcyFactory
 from agntcy_app_sdk.semantic.a2a.protocol import A2AProtocol
-from a2a.types import (
-    SendMessageRequest,
-    MessageSendParams,
-    Message,
-    Part,
-    TextPart,
-    Role,
-)
+from common.a2a_clients import A2AClientCache, first_text_part, text_message_request
 from langchain_core.messages import HumanMessage, SystemMessage
 
-from config.config import DEFAULT_MESSAGE_TRANSPORT, TRANSPORT_SERVER_ENDPOINT
 from resume_mastermind.card import AGENT_CARD as resume_agent_card
 from job_description_mastermind.card import AGENT_CARD as job_description_agent_card
 from interview_mastermind.card import AGENT_CARD as interview_agent_card
 from common.llm import (
-    invoke_structured_with_retry,
+    ainvoke_structured_batch,
+    ainvoke_structured_with_retry,
     JobDescriptionExtractOutput,
     RankingOutput,
     InterviewScoreOutput,
 )
+from database.llm_cache import cache_key, get_cached_responses, store_cached_responses
+from exchange.llm_cache import (
+    INTERVIEW_SCORE_PROMPT_VERSION,
+    JD_SCHEMA_PROMPT_VERSION,
+    LLM_MODEL_ID,
+    cached_call,
+)
+from database.session import get_session
 from schemas import JD_SCHEMA_JSON, resume_schema_to_profile
 from exchange.email_sendgrid import (
-    send_job_opportunity_email,
+    send_job_opportunity_emails_batch,
     send_interview_link_email,
 )
 
 logger = logging.getLogger("corto.exchange.services")
 
+RESUME_AGENT_TOPIC = A2AProtocol.create_agent_topic(resume_agent_card)
+JOB_DESCRIPTION_AGENT_TOPIC = A2AProtocol.create_agent_topic(job_description_agent_card)
+INTERVIEW_AGENT_TOPIC = A2AProtocol.create_agent_topic(interview_agent_card)
+
 FRONTEND_BASE_URL = os.getenv("FRONTEND_BASE_URL", "http://localhost:3000")
 
 
+INTERVIEW_SCORE_SYSTEM = (
+    "You are an interview evaluator. Given the job description, candidate summary, and interview transcript, "
+    "output a score from 0 to 100."
+)
+
+
+def _interview_score_key(job_description: str, resume_summary: str, transcript: str) -> str:
+    return cache_key(
+        INTERVIEW_SCORE_PROMPT_VERSION,
+        LLM_MODEL_ID,
+        job_description.encode("utf-8"),
+        resume_summary.encode("utf-8"),
+        transcript.encode("utf-8"),
+    )
+
+
+def _interview_score_messages(job_description: str, resume_summary: str, transcript: str) -> list:
+    user = f"Job:\n{job_description[:2000]}\n\nCandidate summary:\n{resume_summary[:1000]}\n\nTranscript:\n{transcript[:4000]}"
+    return [SystemMessage(content=INTERVIEW_SCORE_SYSTEM), HumanMessage(content=user)]
+
+
 class AgentClient:
     """Client for resume, job description, and interview masterminds; plus SendGrid emails and in-exchange LLM for ranking/scoring."""
 
     def __init__(self, factory: AgntcyFactory):
         self.factory = factory
+        self._a2a_clients = A2AClientCache(factory, "default/default/exchange")
 
-    async def _send_to_agent(self, agent_card: Any, payload: dict) -> str:
-        topic = A2AProtocol.create_agent_topic(agent_card)
-        transport = self.factory.create_transport(
-            DEFAULT_MESSAGE_TRANSPORT,
-            endpoint=TRANSPORT_SERVER_ENDPOINT,
-            name="default/default/exchange",
-        )
-        client = await self.factory.create_client(
-            "A2A",
-            agent_topic=topic,
-            transport=transport,
-        )
-        request = SendMessageRequest(
-            id=str(uuid4()),
-            params=MessageSendParams(
-                message=Message(
-                    message_id=str(uuid4()),
-                    role=Role.user,
-                    parts=[Part(TextPart(text=json.dumps(payload)))],
-                )
-            ),
-        )
+    async def _send_to_agent(self, agent_topic: str, payload: dict) -> str:
+        client = await self._a2a_clients.get(agent_topic)
+        request = text_message_request(orjson.dumps(payload).decode("utf-8"))
         response = await client.send_message(request)
-        if response.root.result and response.root.result.parts:
-            part = response.root.result.parts[0].root
-            if hasattr(part, "text"):
-                return part.text
+        text = first_text_part(response)
+        if text is not None:
+            return text
         if response.root.error:
             raise RuntimeError(f"A2A error: {response.root.error.message}")
         return ""
@@ -81,11 +88,11 @@ class AgentClient:
         """Call resume mastermind ingest_resume; return {result, profile}."""
         payload = {"action": "ingest_resume", "resume_text": resume_text}
         try:
-            raw = await self._send_to_agent(resume_agent_card, payload)
+            raw = await self._send_to_agent(RESUME_AGENT_TOPIC, payload)
             if isinstance(raw, str) and raw.strip():
                 try:
-                    data = json.loads(raw)
-                except json.JSONDecodeError as e:
+                    data = orjson.loads(raw)
+                except orjson.JSONDecodeError as e:
                     logger.warning(
                         "Resume ingest response was not valid JSON (agent may need restart). raw[:300]=%r err=%s",
                         raw[:300] if raw else "",
@@ -120,10 +127,11 @@ class AgentClient:
             "(each with id, full_name, skills, work_experience, education), rank them by fit (1 = best). "
             "Return only the top 5 as a 'ranked' array of objects with 'profile_id' (integer, the candidate id) and 'rank' (1-based integer)."
         )
-        candidates_json = json.dumps(candidates_payload, indent=0)[:6000]
+        # Compact JSON so the 6000-char prompt budget holds more candidates
+        candidates_json = orjson.dumps(candidates_payload).decode("utf-8")[:6000]
         user = f"Job description:\n{job_schema_str[:4000]}\n\nCandidates:\n{candidates_json}"
         try:
-            result = invoke_structured_with_retry(
+            result = await ainvoke_structured_with_retry(
                 [
                     SystemMessage(content=system),
                     HumanMessage(content=user),
@@ -139,11 +147,11 @@ class AgentClient:
     async def interview_prepare_questions(self, job_content: str, profile_summary: str) -> str:
         payload = {"job_description": job_content, "resume_text": profile_summary}
         try:
-            raw = await self._send_to_agent(interview_agent_card, payload)
+            raw = await self._send_to_agent(INTERVIEW_AGENT_TOPIC, payload)
             if isinstance(raw, str) and raw.strip():
                 try:
-                    data = json.loads(raw)
-                except json.JSONDecodeError:
+                    data = orjson.loads(raw)
+                except orjson.JSONDecodeError:
                     data = {}
             else:
                 data = {}
@@ -161,20 +169,22 @@ class AgentClient:
         job_description_md: str,
         candidate_infos: list[dict],
     ) -> None:
-        """Send interview link email to each candidate via SendGrid."""
+        """Send interview link email to each candidate via SendGrid, concurrently over the shared client."""
         base = (FRONTEND_BASE_URL or "").rstrip("/")
+        sends = []
         for info in candidate_infos:
             email = info.get("email")
             if not email:
                 continue
             token = info.get("interview_link_token")
             link = f"{base}/interview?token={token}" if (base and token) else (base or "about:blank")
-            send_interview_link_email(
+            sends.append(send_interview_link_email(
                 to_email=email,
                 full_name=info.get("full_name") or "Candidate",
                 job_title=job_title or "Interview",
                 interview_link=link,
-            )
+            ))
+        await asyncio.gather(*sends)
 
     async def interview_send_potential_match(
         self,
@@ -182,21 +192,23 @@ class AgentClient:
         job_description_md: str,
         candidate_infos: list[dict],
     ) -> None:
-        """Send job opportunity email (job + profile) to each candidate via SendGrid."""
-        for info in candidate_infos:
-            email = info.get("email")
-            if not email:
-                continue
-            send_job_opportunity_email(
-                to_email=email,
-                full_name=info.get("full_name") or "Candidate",
-                job_title=job_title or "Job opportunity",
-                job_description_md=job_description_md or "",
-                profile_summary=info.get("profile_summary") or "",
-            )
+        """Send job opportunity email (job + profile) to all candidates via one batched SendGrid request."""
+        await send_job_opportunity_emails_batch(
+            job_title=job_title or "Job opportunity",
+            job_description_md=job_description_md or "",
+            recipients=candidate_infos,
+        )
 
     async def job_description_generate_schema(self, description_md: str) -> dict[str, Any] | None:
-        """Extract structured job_description schema from markdown using LLM. Output conforms to JD schema."""
+        """Extract structured job_description schema from markdown using LLM. Output conforms to JD schema.
+        Results are cached in llm_cache by markdown content, so republishing an unchanged JD skips the LLM."""
+        return await cached_call(
+            JD_SCHEMA_PROMPT_VERSION,
+            (description_md.encode("utf-8"),),
+            lambda: self._job_description_generate_schema(description_md),
+        )
+
+    async def _job_description_generate_schema(self, description_md: str) -> dict[str, Any] | None:
         system = (
             "You are an HR expert. Given a job description in markdown, extract structured data that strictly "
             "follows this schema. The root object must have exactly one key 'job_description' whose value is an object with: "
@@ -209,13 +221,17 @@ class AgentClient:
             f"Schema:\n{JD_SCHEMA_JSON}"
         )
         try:
-            result = invoke_structured_with_retry(
+            result = await ainvoke_structured_with_retry(
                 [
                     SystemMessage(content=system),
                     HumanMessage(content=description_md[:8000]),
                 ],
                 JobDescriptionExtractOutput,
             )
+            if not result.job_description:
+                # None, not an empty schema: cached_call would store the empty result for the full TTL
+                logger.warning("JD generate_schema returned an empty job_description")
+                return None
             return {"job_description": result.job_description}
         except Exception as e:
             logger.exception("JD generate_schema failed: %s", e)
@@ -227,24 +243,48 @@ class AgentClient:
         resume_summary: str,
         transcript: str,
     ) -> dict[str, Any]:
-        """Score interview transcript; return {score: float}."""
-        system = (
-            "You are an interview evaluator. Given the job description, candidate summary, and interview transcript, "
-            "output a score from 0 to 100."
+        """Score interview transcript; return {score: float}. Scores are cached in llm_cache by exact inputs."""
+        async def score() -> dict[str, Any]:
+            try:
+                result = await ainvoke_structured_with_retry(
+                    _interview_score_messages(job_description, resume_summary, transcript),
+                    InterviewScoreOutput,
+                )
+                return {"score": result.score}
+            except Exception as e:
+                logger.exception("Interview score failed: %s", e)
+                return {}
+
+        return await cached_call(
+            INTERVIEW_SCORE_PROMPT_VERSION,
+            (job_description.encode("utf-8"), resume_summary.encode("utf-8"), transcript.encode("utf-8")),
+            score,
         )
-        user = f"Job:\n{job_description[:2000]}\n\nCandidate summary:\n{resume_summary[:1000]}\n\nTranscript:\n{transcript[:4000]}"
-        try:
-            result = invoke_structured_with_retry(
-                [
-                    SystemMessage(content=system),
-                    HumanMessage(content=user),
-                ],
-                InterviewScoreOutput,
-            )
-            return {"score": result.score}
-        except Exception as e:
-            logger.exception("Interview score failed: %s", e)
-            return {}
+
+    async def interview_score_batch(self, items: list[dict[str, str]]) -> list[dict[str, Any]]:
+        """Score several transcripts concurrently. Each item has job_description, resume_summary, transcript;
+        returns one {score: float} (or {} on failure) per item, in order. Cached scores are looked up in one query
+        and only the misses go to the LLM."""
+        keys = [_interview_score_key(i["job_description"], i["resume_summary"], i["transcript"]) for i in items]
+        async with get_session() as session:
+            cached = await get_cached_responses(session, keys)
+        misses = [n for n, key in enumerate(keys) if key not in cached]
+        results = await ainvoke_structured_batch(
+            [
+                _interview_score_messages(items[n]["job_description"], items[n]["resume_summary"], items[n]["transcript"])
+                for n in misses
+            ],
+            InterviewScoreOutput,
+        ) if misses else []
+        scores: list[dict[str, Any]] = [cached.get(key, {}) for key in keys]
+        fresh: dict[str, dict[str, Any]] = {}
+        for n, result in zip(misses, results):
+            if isinstance(result, BaseException):
+                logger.error("Interview score failed: %s", result)
+            else:
+                scores[n] = fresh[keys[n]] = {"score": result.score}
+        await store_cached_responses(INTERVIEW_SCORE_PROMPT_VERSION, LLM_MODEL_ID, fresh)
+        return scores
 
     async def job_description_store_interview_results(
         self,
@@ -262,7 +302,7 @@ class AgentClient:
             "top_3_ids": top_3_ids,
         }
         try:
-            await self._send_to_agent(job_description_agent_card, payload)
+            await self._send_to_agent(JOB_DESCRIPTION_AGENT_TOPIC, payload)
         except Exception as e:
             logger.exception("JD mastermind store_interview_results failed: %s", e)
             raise
@@ -29,7 +29,7 @@ class InterviewMastermindAgent:
                 content=f"Job description:\n{job_description}\n\nCandidate resume/summary:\n{resume_or_summary}"
             ),
         ]
-        response = get_llm().invoke(messages)
+        response = await get_llm().ainvoke(messages)
         return response.content.strip()
 
     async def ainvoke(self, payload: str) -> dict[str, Any]:
@@ -3,24 +3,16 @@
 
 import json
 import logging
-from uuid import uuid4
 from typing import Any
 
+import orjson
 from agntcy_app_sdk.factory import AgntcyFactory
+from agntcy_app_sdk.semantic.a2a.protocol import A2AProtocol
+from common.a2a_clients import A2AClientCache, first_text_part, text_message_request
 
 # In-memory store for interview results (job_id -> payload) for retrieval / reporting
 _interview_results_store: dict[int, dict[str, Any]] = {}
-from agntcy_app_sdk.semantic.a2a.protocol import A2AProtocol
-from a2a.types import (
-    SendMessageRequest,
-    MessageSendParams,
-    Message,
-    Part,
-    TextPart,
-    Role,
-)
-
-from config.config import DEFAULT_MESSAGE_TRANSPORT, TRANSPORT_SERVER_ENDPOINT
+
 from resume_mastermind.card import AGENT_CARD as resume_agent_card
 from interview_mastermind.card import AGENT_CARD as interview_agent_card
 
@@ -28,40 +20,24 @@ from ioa_observe.sdk.decorators import agent
 
 logger = logging.getLogger("corto.job_description_mastermind.agent")
 
+RESUME_AGENT_TOPIC = A2AProtocol.create_agent_topic(resume_agent_card)
+INTERVIEW_AGENT_TOPIC = A2AProtocol.create_agent_topic(interview_agent_card)
+
 
 @agent(name="job_description_mastermind_agent")
 class JobDescriptionMastermindAgent:
     def __init__(self, factory: AgntcyFactory):
         self.factory = factory
+        self._a2a_clients = A2AClientCache(factory, "default/default/job-description-mastermind")
 
-    async def _send_to_agent(self, agent_card: Any, payload: dict) -> str:
+    async def _send_to_agent(self, agent_topic: str, payload: dict) -> str:
         """Send JSON payload to an A2A agent and return the text response."""
-        topic = A2AProtocol.create_agent_topic(agent_card)
-        transport = self.factory.create_transport(
-            DEFAULT_MESSAGE_TRANSPORT,
-            endpoint=TRANSPORT_SERVER_ENDPOINT,
-            name="default/default/job-description-mastermind",
-        )
-        client = await self.factory.create_client(
-            "A2A",
-            agent_topic=topic,
-            transport=transport,
-        )
-        request = SendMessageRequest(
-            id=str(uuid4()),
-            params=MessageSendParams(
-                message=Message(
-                    message_id=str(uuid4()),
-                    role=Role.user,
-                    parts=[Part(TextPart(text=json.dumps(payload)))],
-                )
-            ),
-        )
+        client = await self._a2a_clients.get(agent_topic)
+        request = text_message_request(orjson.dumps(payload).decode("utf-8"))
         response = await client.send_message(request)
-        if response.root.result and response.root.result.parts:
-            part = response.root.result.parts[0].root
-            if hasattr(part, "text"):
-                return part.text
+        text = first_text_part(response)
+        if text is not None:
+            return text
         if response.root.error:
             raise RuntimeError(f"A2A error: {response.root.error.message}")
         return ""
@@ -109,7 +85,7 @@ class JobDescriptionMastermindAgent:
 
         try:
             best_matches = await self._send_to_agent(
-                resume_agent_card,
+                RESUME_AGENT_TOPIC,
                 {"action": "best_match", "job_description": jd},
             )
         except Exception as e:
@@ -121,7 +97,7 @@ class JobDescriptionMastermindAgent:
 
         try:
             questions = await self._send_to_agent(
-                interview_agent_card,
+                INTERVIEW_AGENT_TOPIC,
                 {
                     "job_description": jd,
                     "candidate_summary": best_matches,
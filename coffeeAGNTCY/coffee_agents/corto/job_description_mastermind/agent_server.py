@@ -1,8 +1,6 @@
 # Copyright AGNTCY Contributors (https://github.com/agntcy)
 # SPDX-License-Identifier: Apache-2.0
 
-import asyncio
-
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore
@@ -13,6 +11,7 @@ from agntcy_app_sdk.factory import AgntcyFactory
 from agntcy_app_sdk.app_sessions import AppContainer
 from agntcy_app_sdk.semantic.a2a.protocol import A2AProtocol
 
+from common import event_loop
 from config.config import (
     JOB_DESCRIPTION_MASTERMIND_HOST,
     JOB_DESCRIPTION_MASTERMIND_PORT,
@@ -67,7 +66,7 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        event_loop.run(main())
     except KeyboardInterrupt:
         print("\nShutting down gracefully on keyboard interrupt.")
     except Exception as e:
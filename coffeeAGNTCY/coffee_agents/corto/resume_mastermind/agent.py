@@ -9,7 +9,7 @@ from langchain_core.messages import HumanMessage, SystemMessage
 
 from ioa_observe.sdk.decorators import agent
 
-from common.llm import get_llm, invoke_structured_with_retry, ResumeExtractOutput
+from common.llm import get_llm, ainvoke_structured_with_retry, ResumeExtractOutput
 from schemas import RESUME_SCHEMA_JSON, resume_schema_to_profile
 
 logger = logging.getLogger("corto.resume_mastermind.agent")
@@ -44,7 +44,7 @@ class ResumeMastermindAgent:
             HumanMessage(content=resume_text),
         ]
         try:
-            result = invoke_structured_with_retry(messages, ResumeExtractOutput)
+            result = await ainvoke_structured_with_retry(messages, ResumeExtractOutput)
             data = result.to_resume_dict()
             self._resumes.append(data)
             profile = resume_schema_to_profile(data)
@@ -75,7 +75,7 @@ class ResumeMastermindAgent:
                 content=f"Job description:\n{job_description}\n\nCandidates:\n{candidates_summary}"
             ),
         ]
-        response = get_llm().invoke(messages)
+        response = await get_llm().ainvoke(messages)
         return response.content.strip()
 
     async def ainvoke(self, payload: str) -> dict[str, Any]:
@@ -4,6 +4,7 @@
 import json
 import logging
 
+import orjson
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
 from a2a.types import (
@@ -69,7 +70,7 @@ class ResumeMastermindExecutor(AgentExecutor):
                 data = {}
             if data.get("action") == "ingest_resume":
                 await event_queue.enqueue_event(
-                    new_agent_text_message(json.dumps(output))
+                    new_agent_text_message(orjson.dumps(output).decode("utf-8"))
                 )
             else:
                 await event_queue.enqueue_event(
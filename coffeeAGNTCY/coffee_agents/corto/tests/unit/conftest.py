@@ -0,0 +1,22 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+
+# Unit tests never touch ./corto.db; each test gets its own in-memory database below
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite://"
+
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.models import Base
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Session factory over a fresh in-memory SQLite database with all tables created."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    await engine.dispose()
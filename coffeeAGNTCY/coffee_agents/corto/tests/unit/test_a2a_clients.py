@@ -0,0 +1,103 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+from a2a.types import (
+    JSONRPCError,
+    JSONRPCErrorResponse,
+    Message,
+    Part,
+    Role,
+    SendMessageRequest,
+    SendMessageResponse,
+    SendMessageSuccessResponse,
+    TextPart,
+)
+
+from common.a2a_clients import A2AClientCache, first_text_part, text_message_request
+
+
+def test_text_message_request_matches_validated_model():
+    request = text_message_request("hello")
+    validated = SendMessageRequest.model_validate(request.model_dump(mode="json"))
+    assert validated.params.message.role == Role.user
+    assert [p.root.text for p in validated.params.message.parts] == ["hello"]
+    assert validated.method == "message/send"
+
+
+def test_text_message_request_ids_are_distinct_hex():
+    first, second = text_message_request("a"), text_message_request("a")
+    ids = [first.id, first.params.message.message_id, second.id, second.params.message.message_id]
+    assert len(set(ids)) == 4
+    for value in ids:
+        assert len(value) == 32
+        int(value, 16)
+
+
+def _reply(*parts: Part) -> SendMessageResponse:
+    return SendMessageResponse(
+        root=SendMessageSuccessResponse(id="1", result=Message(message_id="m", role=Role.agent, parts=list(parts)))
+    )
+
+
+def test_first_text_part():
+    assert first_text_part(_reply(Part(root=TextPart(text="one")), Part(root=TextPart(text="two")))) == "one"
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        None,
+        _reply(),
+        SendMessageResponse(root=JSONRPCErrorResponse(id="1", error=JSONRPCError(code=-32000, message="boom"))),
+    ],
+    ids=["none", "no-parts", "error"],
+)
+def test_first_text_part_missing(response):
+    assert first_text_part(response) is None
+
+
+class _Factory:
+    """Counts transports and clients built through the AgntcyFactory calls A2AClientCache makes."""
+
+    def __init__(self):
+        self.transports = []
+        self.clients = []
+
+    def create_transport(self, transport_type, **kwargs):
+        self.transports.append((transport_type, kwargs))
+        return object()
+
+    async def create_client(self, protocol, agent_topic, transport):
+        await asyncio.sleep(0)
+        client = (protocol, agent_topic, transport)
+        self.clients.append(client)
+        return client
+
+
+@pytest.mark.asyncio
+async def test_client_cache_builds_one_transport_and_one_client_per_topic():
+    factory = _Factory()
+    cache = A2AClientCache(factory, "exchange")
+
+    first = await cache.get("resume")
+    assert await cache.get("resume") is first
+    other = await cache.get("interview")
+
+    assert len(factory.transports) == 1
+    assert factory.transports[0][1]["name"] == "exchange"
+    assert [c[1] for c in factory.clients] == ["resume", "interview"]
+    assert first[2] is other[2]
+
+
+@pytest.mark.asyncio
+async def test_client_cache_concurrent_first_use_creates_one_client():
+    factory = _Factory()
+    cache = A2AClientCache(factory, "exchange")
+
+    clients = await asyncio.gather(*(cache.get("resume") for _ in range(10)))
+
+    assert len(factory.clients) == 1
+    assert all(c is clients[0] for c in clients)
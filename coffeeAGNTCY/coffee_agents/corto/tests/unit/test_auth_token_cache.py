@@ -0,0 +1,102 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from auth import deps
+
+
+def _token(sub="7", role="employer", exp_in=3600):
+    payload = {"sub": sub, "username": "alice", "role": role, "exp": int(time.time()) + exp_in}
+    return jwt.encode(payload, deps.JWT_SECRET, algorithm=deps.JWT_ALGORITHM)
+
+
+def _creds(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    deps._token_cache.clear()
+    yield
+    deps._token_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_verified_token_is_cached():
+    token = _token()
+    user = await deps.get_current_user(_creds(token))
+    assert user == {"user_id": 7, "username": "alice", "role": "employer"}
+    assert token in deps._token_cache
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_returns_a_copy():
+    token = _token()
+    first = await deps.get_current_user(_creds(token))
+    first["role"] = "candidate"
+    second = await deps.get_current_user(_creds(token))
+    assert second["role"] == "employer"
+    assert deps._token_cache[token][0]["role"] == "employer"
+
+
+@pytest.mark.asyncio
+async def test_cached_entry_near_expiry_is_reverified(monkeypatch):
+    token = _token()
+    await deps.get_current_user(_creds(token))
+    user, _ = deps._token_cache[token]
+    deps._token_cache[token] = (user, time.time() + deps._TOKEN_EXP_LEEWAY_SECONDS - 1)
+
+    calls = []
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(deps.jwt, "decode", counting_decode)
+    await deps.get_current_user(_creds(token))
+    assert calls == [1]
+    assert deps._token_cache[token][1] > time.time() + deps._TOKEN_EXP_LEEWAY_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_rejected_and_not_cached():
+    token = _token(exp_in=-60)
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_current_user(_creds(token))
+    assert exc.value.status_code == 401
+    assert exc.value.detail == "Token expired"
+    assert token not in deps._token_cache
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_is_not_cached():
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_current_user(_creds("not-a-jwt"))
+    assert exc.value.status_code == 401
+    assert deps._token_cache == {}
+
+
+def test_full_cache_evicts_expired_entries_first(monkeypatch):
+    monkeypatch.setattr(deps, "_TOKEN_CACHE_MAX", 3)
+    now = time.time()
+    deps._token_cache["live"] = ({}, now + 600)
+    deps._token_cache["dead"] = ({}, now - 1)
+    deps._token_cache["live2"] = ({}, now + 600)
+    deps._cache_token("new", {}, now + 600)
+    assert list(deps._token_cache) == ["live", "live2", "new"]
+
+
+def test_full_cache_evicts_oldest_when_nothing_expired(monkeypatch):
+    monkeypatch.setattr(deps, "_TOKEN_CACHE_MAX", 2)
+    now = time.time()
+    deps._cache_token("a", {}, now + 600)
+    deps._cache_token("b", {}, now + 600)
+    deps._cache_token("c", {}, now + 600)
+    assert list(deps._token_cache) == ["b", "c"]
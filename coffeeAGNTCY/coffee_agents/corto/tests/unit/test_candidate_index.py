@@ -0,0 +1,105 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from sqlalchemy import Select, insert, select
+
+from database.candidate_index import _language_rows, _skill_names, sync_candidate_index
+from database.models import CandidateLanguage, CandidateProfile, CandidateSkill, Skill, User
+
+
+def test_skill_names_normalizes_and_dedupes():
+    assert _skill_names([" Python ", "python", "SQL", "", "  ", None, 3]) == {"python", "sql"}
+    assert _skill_names(None) == set()
+    assert _skill_names(["x" * 300]) == {"x" * 255}
+
+
+def test_language_rows_accepts_strings_and_dicts():
+    rows = _language_rows([
+        "English",
+        {"language": " French ", "proficiency": "B2"},
+        {"language": "", "proficiency": "C1"},
+        {"proficiency": "A1"},
+        42,
+    ])
+    assert rows == {"english": None, "french": "B2"}
+
+
+async def _profile(session, user_id, **columns) -> CandidateProfile:
+    session.add(User(id=user_id, username=f"u{user_id}", password_hash="x"))
+    profile = CandidateProfile(user_id=user_id, **columns)
+    session.add(profile)
+    await session.flush()
+    return profile
+
+
+async def _skills_of(session, profile) -> set[str]:
+    rows = await session.execute(
+        select(Skill.name).join(CandidateSkill, CandidateSkill.skill_id == Skill.id).where(
+            CandidateSkill.profile_id == profile.id
+        )
+    )
+    return set(rows.scalars())
+
+
+@pytest.mark.asyncio
+async def test_sync_writes_skills_and_languages(session_factory):
+    async with session_factory() as session:
+        profile = await _profile(
+            session, 1, skills=["Python", "SQL"], languages=["English", {"language": "German", "proficiency": "A2"}]
+        )
+        await sync_candidate_index(session, profile)
+        await session.commit()
+
+        assert await _skills_of(session, profile) == {"python", "sql"}
+        languages = (
+            await session.execute(select(CandidateLanguage.language, CandidateLanguage.proficiency).where(
+                CandidateLanguage.profile_id == profile.id
+            ))
+        ).all()
+        assert sorted(languages) == [("english", None), ("german", "A2")]
+
+
+@pytest.mark.asyncio
+async def test_resync_replaces_rows_and_shares_skills(session_factory):
+    async with session_factory() as session:
+        first = await _profile(session, 1, skills=["Python"])
+        second = await _profile(session, 2, skills=["python", "Go"])
+        await sync_candidate_index(session, first)
+        await sync_candidate_index(session, second)
+        await session.commit()
+
+        first.skills = ["Rust"]
+        first.languages = ["Spanish"]
+        await sync_candidate_index(session, first)
+        await session.commit()
+
+        assert await _skills_of(session, first) == {"rust"}
+        assert await _skills_of(session, second) == {"python", "go"}
+        assert sorted((await session.execute(select(Skill.name))).scalars()) == ["go", "python", "rust"]
+
+
+@pytest.mark.asyncio
+async def test_skill_inserted_concurrently_is_reused(session_factory):
+    async with session_factory() as session:
+        profile = await _profile(session, 1, skills=["Python", "SQL"])
+        real_execute = session.execute
+        raced = False
+
+        async def racing_execute(statement, *args, **kwargs):
+            # Another profile's sync adds "python" right after this sync found it missing
+            nonlocal raced
+            result = await real_execute(statement, *args, **kwargs)
+            if not raced and isinstance(statement, Select) and Skill.__table__ in statement.get_final_froms():
+                raced = True
+                await real_execute(insert(Skill).values(name="python"))
+            return result
+
+        session.execute = racing_execute
+        await sync_candidate_index(session, profile)
+        await session.commit()
+        session.execute = real_execute
+
+        assert raced
+        assert await _skills_of(session, profile) == {"python", "sql"}
+        assert sorted((await session.execute(select(Skill.name))).scalars()) == ["python", "sql"]
@@ -0,0 +1,106 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import httpx
+import orjson
+import pytest
+
+from exchange import email_sendgrid
+
+
+class _SendGrid:
+    """Records decoded /mail/send bodies and answers each with handler(body)."""
+
+    def __init__(self):
+        self.bodies = []
+        self.handler = lambda body: httpx.Response(202)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = orjson.loads(request.content)
+        self.bodies.append(body)
+        return self.handler(body)
+
+
+@pytest.fixture
+def sendgrid(monkeypatch):
+    fake = _SendGrid()
+    monkeypatch.setattr(email_sendgrid, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(fake)))
+    return fake
+
+
+def _recipients(n):
+    return [{"email": f"c{i}@example.com", "full_name": f"C{i}", "profile_summary": f"line1\nline{i}"} for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_batch_chunks_by_personalization_limit(monkeypatch, sendgrid):
+    monkeypatch.setattr(email_sendgrid, "_MAX_PERSONALIZATIONS", 2)
+    sent = await email_sendgrid.send_job_opportunity_emails_batch("Engineer", "# JD", _recipients(5))
+    assert sent == 5
+    assert sorted(len(b["personalizations"]) for b in sendgrid.bodies) == [1, 2, 2]
+    emails = sorted(p["to"][0]["email"] for b in sendgrid.bodies for p in b["personalizations"])
+    assert emails == [f"c{i}@example.com" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_batch_substitutions_fill_shared_body(sendgrid):
+    recipients = [{"email": "a@example.com", "full_name": "Ann <Lee>", "profile_summary": "x & y\nz"}]
+    await email_sendgrid.send_job_opportunity_emails_batch("Engineer", "# JD", recipients)
+    (body,) = sendgrid.bodies
+    html_body = body["content"][1]["value"]
+    assert email_sendgrid._FULL_NAME_TAG in html_body
+    assert email_sendgrid._PROFILE_HTML_TAG in html_body
+    assert body["personalizations"] == [{
+        "to": [{"email": "a@example.com"}],
+        "substitutions": {
+            email_sendgrid._FULL_NAME_TAG: "Ann &lt;Lee&gt;",
+            email_sendgrid._PROFILE_HTML_TAG: "x &amp; y<br>\nz",
+        },
+    }]
+    assert body["content"][0]["type"] == "text/plain"
+
+
+@pytest.mark.asyncio
+async def test_batch_skips_missing_and_malformed_addresses(sendgrid):
+    recipients = _recipients(1) + [
+        {"email": ""},
+        {"email": "not-an-address"},
+        {"email": "a@example.com, b@example.com"},
+        {"email": "Ann <a@example.com>"},
+    ]
+    assert await email_sendgrid.send_job_opportunity_emails_batch("Engineer", "", recipients) == 1
+    assert [p["to"][0]["email"] for b in sendgrid.bodies for p in b["personalizations"]] == ["c0@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_oversize_substitutions_are_sent_individually(sendgrid):
+    big = {"email": "big@example.com", "full_name": "Big", "profile_summary": "p" * 20_000}
+    sent = await email_sendgrid.send_job_opportunity_emails_batch("Engineer", "", _recipients(2) + [big])
+    assert sent == 3
+    batch = [b for b in sendgrid.bodies if "substitutions" in b["personalizations"][0]]
+    single = [b for b in sendgrid.bodies if "substitutions" not in b["personalizations"][0]]
+    assert [p["to"][0]["email"] for p in batch[0]["personalizations"]] == ["c0@example.com", "c1@example.com"]
+    assert len(single) == 1
+    assert single[0]["personalizations"] == [{"to": [{"email": "big@example.com"}]}]
+    assert "p" * 20_000 in single[0]["content"][1]["value"]
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_falls_back_to_individual_sends(sendgrid):
+    def handler(body):
+        # Reject the batch request; accept single sends except one bad recipient
+        if len(body["personalizations"]) > 1 or body["personalizations"][0]["to"][0]["email"] == "c1@example.com":
+            return httpx.Response(400)
+        return httpx.Response(202)
+
+    sendgrid.handler = handler
+    sent = await email_sendgrid.send_job_opportunity_emails_batch("Engineer", "", _recipients(3))
+    assert sent == 2
+    assert len(sendgrid.bodies) == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_not_retried_individually(sendgrid):
+    sendgrid.handler = lambda body: httpx.Response(429)
+    assert await email_sendgrid.send_job_opportunity_emails_batch("Engineer", "", _recipients(3)) == 0
+    assert len(sendgrid.bodies) == 1
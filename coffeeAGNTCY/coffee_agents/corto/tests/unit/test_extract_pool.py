@@ -0,0 +1,56 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+CORTO_ROOT = Path(__file__).resolve().parents[2]
+
+# Started with python -m like exchange/__main__.py, then does what the uvicorn server process does:
+# imports exchange.main and runs its lifespan. A worker reports which app modules it loaded and the script (if any)
+# it re-ran as its __main__
+_LAUNCHER_MAIN = '''
+import asyncio
+
+from exchange.main import app, lifespan
+
+
+async def main():
+    async with lifespan(app):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            app.state.extract_pool,
+            eval,
+            "([m for m in ('exchange.main', 'launcher.__main__') if m in __import__('sys').modules],"
+            " getattr(__import__('sys').modules['__main__'], '__file__', None))",
+        )
+
+
+print(repr(asyncio.run(main())))
+'''
+
+
+def test_extract_pool_workers_never_import_exchange_main(tmp_path):
+    launcher = tmp_path / "launcher"
+    launcher.mkdir()
+    (launcher / "__init__.py").write_text("")
+    (launcher / "__main__.py").write_text(_LAUNCHER_MAIN)
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join((str(tmp_path), str(CORTO_ROOT))),
+        "DATABASE_URL": "sqlite+aiosqlite://",
+    }
+
+    result = subprocess.run(
+        [sys.executable, "-m", "launcher"],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "([], None)"
@@ -0,0 +1,54 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from sqlalchemy import func, select
+
+from common.llm import JobDescriptionExtractOutput
+from database import llm_cache as database_llm_cache
+from database.models import LlmCache
+from exchange import llm_cache as exchange_llm_cache
+from exchange import services
+from exchange.services import AgentClient
+
+
+@pytest.fixture
+def extraction(session_factory, monkeypatch):
+    """Route llm_cache to the test database and answer the JD extraction LLM call with outputs[0], outputs[1], ..."""
+    monkeypatch.setattr(database_llm_cache, "get_session", session_factory)
+    monkeypatch.setattr(exchange_llm_cache, "get_session", session_factory)
+    outputs = []
+    calls = []
+
+    async def fake_ainvoke(messages, model):
+        calls.append(model)
+        return outputs[len(calls) - 1]
+
+    monkeypatch.setattr(services, "ainvoke_structured_with_retry", fake_ainvoke)
+    return outputs, calls
+
+
+async def _cached_rows(session_factory) -> int:
+    async with session_factory() as session:
+        return (await session.execute(select(func.count()).select_from(LlmCache))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_empty_extraction_is_not_cached(session_factory, extraction):
+    outputs, calls = extraction
+    outputs += [
+        JobDescriptionExtractOutput(job_description={}),
+        JobDescriptionExtractOutput(job_description={"summary": "Build things"}),
+    ]
+    client = AgentClient(factory=None)
+
+    assert await client.job_description_generate_schema("# Engineer") is None
+    assert await _cached_rows(session_factory) == 0
+
+    # The republish calls the LLM again instead of replaying the empty result
+    assert await client.job_description_generate_schema("# Engineer") == {"job_description": {"summary": "Build things"}}
+    assert len(calls) == 2
+    assert await _cached_rows(session_factory) == 1
+
+    assert await client.job_description_generate_schema("# Engineer") == {"job_description": {"summary": "Build things"}}
+    assert len(calls) == 2
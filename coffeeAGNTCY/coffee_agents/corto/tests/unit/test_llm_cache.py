@@ -0,0 +1,117 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from database import llm_cache
+from database.llm_cache import (
+    cache_key,
+    delete_cached_response,
+    get_cached_response,
+    get_cached_responses,
+    put_cached_response,
+    store_cached_responses,
+)
+from database.models import LlmCache
+
+
+def test_cache_key_is_stable_and_hex():
+    key = cache_key("resume_ingest/1", "model-a", b"hello")
+    assert key == cache_key("resume_ingest/1", "model-a", b"hello")
+    assert len(key) == 64
+    int(key, 16)
+
+
+def test_cache_key_varies_with_every_field():
+    base = cache_key("v/1", "model-a", b"x")
+    assert cache_key("v/2", "model-a", b"x") != base
+    assert cache_key("v/1", "model-b", b"x") != base
+    assert cache_key("v/1", "model-a", b"y") != base
+
+
+def test_cache_key_fields_cannot_run_together():
+    assert cache_key("v/1", "m", b"ab", b"c") != cache_key("v/1", "m", b"a", b"bc")
+    assert cache_key("v/1", "m", b"abc") != cache_key("v/1", "m", b"ab", b"c")
+
+
+@pytest.mark.asyncio
+async def test_put_then_get(session_factory):
+    async with session_factory() as session:
+        await put_cached_response(session, "k1", "v/1", "m", {"a": 1})
+        await session.commit()
+    async with session_factory() as session:
+        assert await get_cached_response(session, "k1") == {"a": 1}
+        assert await get_cached_response(session, "missing") is None
+
+
+@pytest.mark.asyncio
+async def test_put_sets_ttl_and_expired_entries_are_misses(session_factory):
+    async with session_factory() as session:
+        await put_cached_response(session, "k1", "v/1", "m", {"a": 1}, ttl=timedelta(hours=1))
+        await put_cached_response(session, "k2", "v/1", "m", {"b": 2})
+        await session.commit()
+        row = (await session.execute(select(LlmCache).where(LlmCache.input_hash == "k1"))).scalar_one()
+        assert row.expires_at - row.created_at == timedelta(hours=1)
+
+        await session.execute(
+            update(LlmCache)
+            .where(LlmCache.input_hash == "k1")
+            .values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+        )
+        await session.commit()
+        assert await get_cached_response(session, "k1") is None
+        assert await get_cached_responses(session, ["k1", "k2"]) == {"k2": {"b": 2}}
+
+
+@pytest.mark.asyncio
+async def test_put_upserts_existing_key(session_factory):
+    async with session_factory() as session:
+        await put_cached_response(session, "k1", "v/1", "m", {"a": 1})
+        await session.commit()
+    # A second writer that missed the cache concurrently must refresh the row, not hit the primary key
+    async with session_factory() as session:
+        await put_cached_response(session, "k1", "v/1", "m", {"a": 2})
+        await session.commit()
+    async with session_factory() as session:
+        rows = (await session.execute(select(LlmCache))).scalars().all()
+        assert [(r.input_hash, r.response) for r in rows] == [("k1", {"a": 2})]
+
+
+@pytest.mark.asyncio
+async def test_delete_cached_response(session_factory):
+    async with session_factory() as session:
+        await put_cached_response(session, "k1", "v/1", "m", {"a": 1})
+        await put_cached_response(session, "k2", "v/1", "m", {"b": 2})
+        await session.commit()
+        await delete_cached_response(session, "k1")
+        await session.commit()
+        assert await get_cached_responses(session, ["k1", "k2"]) == {"k2": {"b": 2}}
+
+
+@pytest.mark.asyncio
+async def test_get_cached_responses_empty_input(session_factory):
+    async with session_factory() as session:
+        assert await get_cached_responses(session, []) == {}
+
+
+@pytest.mark.asyncio
+async def test_store_cached_responses_commits_in_own_session(session_factory, monkeypatch):
+    monkeypatch.setattr(llm_cache, "get_session", session_factory)
+    await store_cached_responses("v/1", "m", {"k1": {"a": 1}, "k2": {"b": 2}})
+    async with session_factory() as session:
+        assert await get_cached_responses(session, ["k1", "k2"]) == {"k1": {"a": 1}, "k2": {"b": 2}}
+
+
+@pytest.mark.asyncio
+async def test_store_cached_responses_never_raises(monkeypatch):
+    @asynccontextmanager
+    async def broken_session():
+        raise RuntimeError("database is locked")
+        yield
+
+    monkeypatch.setattr(llm_cache, "get_session", broken_session)
+    await store_cached_responses("v/1", "m", {"k1": {"a": 1}})
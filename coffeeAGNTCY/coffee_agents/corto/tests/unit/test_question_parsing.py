@@ -0,0 +1,59 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+
+from exchange.main import _QUESTION_LINE_RE, _parse_questions_from_agent
+
+
+def _reference(questions_text):
+    """The line-by-line parser _QUESTION_LINE_RE replaced."""
+    if not (questions_text or "").strip():
+        return []
+    lines = (questions_text or "").strip().split("\n")
+    questions = [
+        line.strip()
+        for line in lines
+        if line.strip() and (line.strip()[0].isdigit() or line.strip().startswith("-"))
+    ]
+    if not questions:
+        questions = [q.strip() for q in lines if q.strip()][:10]
+    return questions[:10]
+
+
+CASES = {
+    "numbered": "1. Tell me about yourself.\n2. Why this role?\n3) What is a closure?",
+    "dashes": "- First?\n  - Indented second?\n-Third?",
+    "preamble": "Here are your questions:\n\n1. One?\nSome commentary\n2. Two?\nGood luck!",
+    "crlf": "1. One?\r\n2. Two?  \r\n\r\n",
+    "tabs": "\t1.\tOne?\t\n\t- Two?",
+    "no-list": "What drew you here?\n\nDescribe a hard bug.",
+    "more-than-ten": "\n".join(f"{i}. Q{i}?" for i in range(1, 15)),
+    "long-prose": "\n".join(f"Question {i}?" for i in range(1, 15)),
+    "blank": "  \n\t\n",
+    "empty": "",
+    "none": None,
+}
+
+
+@pytest.mark.parametrize("text", CASES.values(), ids=CASES.keys())
+def test_matches_line_by_line_parser(text):
+    assert _parse_questions_from_agent(text) == _reference(text)
+
+
+def test_keeps_whole_stripped_line_with_numbering():
+    assert _parse_questions_from_agent("  1. One?  \n  - Two?\n") == ["1. One?", "- Two?"]
+
+
+def test_question_line_pattern():
+    assert _QUESTION_LINE_RE.findall("intro\n 12. a \nb\n-c\n") == ["12. a", "-c"]
+    assert _QUESTION_LINE_RE.findall("no list here") == []
+
+
+def test_non_list_reply_falls_back_to_all_lines():
+    assert _parse_questions_from_agent("Why us?\n\n  How so?  ") == ["Why us?", "How so?"]
+
+
+def test_at_most_ten():
+    assert len(_parse_questions_from_agent(CASES["more-than-ten"])) == 10
+    assert len(_parse_questions_from_agent(CASES["long-prose"])) == 10
@@ -0,0 +1,105 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import subprocess
+
+import pytest
+
+from exchange import resume_text
+
+
+class _Backends:
+    """Stand-ins for the PDF backends: record the call order and raise where failures[name] is set."""
+
+    def __init__(self):
+        self.calls = []
+        self.failures = {}
+
+    def backend(self, name):
+        def extract(content: bytes) -> str:
+            self.calls.append(name)
+            if name in self.failures:
+                raise self.failures[name]
+            return f"{name}:{content.decode()}"
+
+        return extract
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    fake = _Backends()
+    monkeypatch.setattr(resume_text, "PYMUPDF_AVAILABLE", True)
+    monkeypatch.setattr(resume_text, "PDFTOTEXT", "/usr/bin/pdftotext")
+    monkeypatch.setattr(resume_text, "_extract_text_pdf_pymupdf", fake.backend("pymupdf"))
+    monkeypatch.setattr(resume_text, "_extract_text_pdftotext", fake.backend("pdftotext"))
+    monkeypatch.setattr(resume_text, "_extract_text_pypdf", fake.backend("pypdf"))
+    return fake
+
+
+def test_pymupdf_is_preferred(backends):
+    assert resume_text.extract_text_pdf(b"cv") == "pymupdf:cv"
+    assert backends.calls == ["pymupdf"]
+
+
+def test_damaged_file_falls_back_to_pdftotext(backends):
+    backends.failures["pymupdf"] = RuntimeError("cannot open broken document")
+    assert resume_text.extract_text_pdf(b"cv") == "pdftotext:cv"
+    assert backends.calls == ["pymupdf", "pdftotext"]
+
+
+@pytest.mark.parametrize(
+    "error",
+    [subprocess.CalledProcessError(1, "pdftotext"), subprocess.TimeoutExpired("pdftotext", 60), FileNotFoundError()],
+    ids=["exit-status", "timeout", "missing-binary"],
+)
+def test_pdftotext_failure_falls_back_to_pypdf(backends, error):
+    backends.failures["pymupdf"] = RuntimeError("broken")
+    backends.failures["pdftotext"] = error
+    assert resume_text.extract_text_pdf(b"cv") == "pypdf:cv"
+    assert backends.calls == ["pymupdf", "pdftotext", "pypdf"]
+
+
+def test_unavailable_backends_are_skipped(backends, monkeypatch):
+    monkeypatch.setattr(resume_text, "PYMUPDF_AVAILABLE", False)
+    assert resume_text.extract_text_pdf(b"cv") == "pdftotext:cv"
+    monkeypatch.setattr(resume_text, "PDFTOTEXT", None)
+    assert resume_text.extract_text_pdf(b"cv") == "pypdf:cv"
+    assert backends.calls == ["pdftotext", "pypdf"]
+
+
+def test_unexpected_pymupdf_errors_propagate(backends):
+    backends.failures["pymupdf"] = MemoryError()
+    with pytest.raises(MemoryError):
+        resume_text.extract_text_pdf(b"cv")
+    assert backends.calls == ["pymupdf"]
+
+
+def _blank_pdf() -> bytes:
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+def test_pypdf_backend_reads_a_real_pdf():
+    assert resume_text._extract_text_pypdf(_blank_pdf()) == ""
+
+
+def test_extractors_cover_accepted_types():
+    assert set(resume_text.EXTRACTORS) == {".pdf", ".docx"}
+
+
+@pytest.mark.skipif(not resume_text.DOCX_AVAILABLE, reason="python-docx not installed")
+def test_docx_paragraphs_are_joined():
+    from docx import Document
+
+    document = Document()
+    document.add_paragraph("Jane Doe")
+    document.add_paragraph("Engineer")
+    buf = io.BytesIO()
+    document.save(buf)
+    assert resume_text.extract_text_docx(buf.getvalue()) == "Jane Doe\nEngineer"
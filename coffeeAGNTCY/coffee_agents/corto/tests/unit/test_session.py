@@ -0,0 +1,38 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+CORTO_ROOT = Path(__file__).resolve().parents[2]
+
+# database.session picks its engine from DATABASE_URL at import, so a file-backed engine needs a fresh interpreter
+_READ_PRAGMAS = '''
+import asyncio
+
+from sqlalchemy import text
+
+from database.session import engine
+
+
+async def main():
+    async with engine.connect() as conn:
+        for pragma in ("journal_mode", "synchronous", "cache_size", "mmap_size"):
+            print(pragma, (await conn.execute(text(f"PRAGMA {pragma}"))).scalar())
+    await engine.dispose()
+
+
+asyncio.run(main())
+'''
+
+
+def test_file_backed_sqlite_connections_are_tuned(tmp_path):
+    env = {**os.environ, "PYTHONPATH": str(CORTO_ROOT), "DATABASE_URL": f"sqlite+aiosqlite:///{tmp_path / 'corto.db'}"}
+    result = subprocess.run(
+        [sys.executable, "-c", _READ_PRAGMAS], env=env, capture_output=True, text=True, timeout=60, check=True
+    )
+    pragmas = dict(line.split() for line in result.stdout.splitlines())
+    # synchronous=NORMAL reads back as 1
+    assert pragmas == {"journal_mode": "wal", "synchronous": "1", "cache_size": "-20000", "mmap_size": "268435456"}